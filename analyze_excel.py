@@ -2,57 +2,66 @@
 """
 Script to analyze the current Financial Dashboard Excel file structure
 """
-import pandas as pd
-import openpyxl
-from openpyxl import load_workbook
 import sys
 import os
+from workbook_loader import WorkbookLoader
+from sheet_schemas import SOURCE_SCHEMAS, SchemaDriftError
 
-def analyze_excel_file(file_path):
-    """Analyze the structure of an Excel file"""
-    print(f"Analyzing Excel file: {file_path}")
-    print("=" * 60)
+def analyze_workbook(file_path, sheets=None, use_cache=True, engine=None, check_schema=False):
+    """Describe every sheet (or the requested ones) of a workbook as plain data"""
+    with WorkbookLoader(file_path, use_cache=use_cache, engine=engine) as loader:
+        sheet_names = list(loader.sheet_names)
+        summaries = list(loader.summaries(sheets))
+        report = {'file': file_path, 'engine': loader.engine, 'sheet_names': sheet_names,
+                  'sheets': summaries}
+        if check_schema:
+            report['schema_drift'] = loader.check_schemas(sheets, SOURCE_SCHEMAS)
+        return report
+
+def print_analysis(report):
+    """Print an analyze_workbook report"""
+    print(f"Total sheets: {len(report['sheet_names'])}")
+    print(f"Sheet names: {report['sheet_names']}")
+    print(f"Reader engine: {report['engine']}")
+    if 'schema_drift' in report:
+        if report['schema_drift']:
+            print(f"✗ {SchemaDriftError(report['schema_drift'])}")
+        else:
+            print("✓ Every sheet matches its schema")
+    print()
     
-    try:
-        # Load the workbook
-        wb = load_workbook(file_path, read_only=True)
-        
-        print(f"Total sheets: {len(wb.sheetnames)}")
-        print(f"Sheet names: {wb.sheetnames}")
-        print()
+    # Analyze each sheet
+    for i, summary in enumerate(report['sheets'], 1):
+        print(f"{i}. Sheet: '{summary['sheet']}'")
+        print("-" * 40)
         
-        # Analyze each sheet
-        for i, sheet_name in enumerate(wb.sheetnames, 1):
-            print(f"{i}. Sheet: '{sheet_name}'")
-            print("-" * 40)
+        if summary['error'] is not None:
+            print(f"   Error reading sheet data: {summary['error']}")
+        else:
+            print(f"   Dimensions: {summary['rows']} rows × {summary['columns']} columns")
             
-            # Load sheet data
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                print(f"   Dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
+            if summary['rows'] or summary['columns']:
+                headers = summary['headers']
+                print(f"   Column headers: {headers[:10]}{'...' if len(headers) > 10 else ''}")
                 
-                if not df.empty:
-                    print(f"   Column headers: {list(df.columns[:10])}{'...' if len(df.columns) > 10 else ''}")
-                    
-                    # Show first few rows of data (non-empty cells)
-                    non_empty_data = df.dropna(how='all').head(3)
-                    if not non_empty_data.empty:
-                        print("   Sample data (first 3 non-empty rows):")
-                        for idx, row in non_empty_data.iterrows():
-                            non_null_values = row.dropna()
-                            if len(non_null_values) > 0:
-                                sample_values = dict(list(non_null_values.items())[:5])
-                                print(f"     Row {idx}: {sample_values}")
-                else:
-                    print("   Sheet appears to be empty")
-                    
-            except Exception as e:
-                print(f"   Error reading sheet data: {e}")
-            
-            print()
-        
-        wb.close()
+                # Show first few rows of data (non-empty cells)
+                if summary['sample']:
+                    print("   Sample data (first 3 non-empty rows):")
+                    for sample in summary['sample']:
+                        print(f"     Row {sample['row']}: {sample['values']}")
+            else:
+                print("   Sheet appears to be empty")
         
+        print()
+
+def analyze_excel_file(file_path, sheets=None, use_cache=True, engine=None):
+    """Analyze the structure of an Excel file"""
+    print(f"Analyzing Excel file: {file_path}")
+    print("=" * 60)
+    
+    try:
+        # Open the workbook once (sheets come from the cache when unchanged)
+        print_analysis(analyze_workbook(file_path, sheets, use_cache, engine))
     except Exception as e:
         print(f"Error analyzing file: {e}")
         return False
@@ -60,7 +69,8 @@ def analyze_excel_file(file_path):
     return True
 
 def main():
-    file_path = "/Users/marcusberley/Desktop/Financial Dashboard.xlsx"
+    # Same as `dashboard_cli.py analyze FILE`; the path argument is optional for the old workflow
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "/Users/marcusberley/Desktop/Financial Dashboard.xlsx"
     
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}")
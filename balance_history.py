@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Account balance history for the Financial Dashboard streamliner
+Every run appends the current account balances to a local SQLite table keyed
+by account and capture date, so changes over any window can be queried later
+without the source workbook having to carry them
+"""
+import os
+import sqlite3
+from datetime import date, timedelta
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS balances (
+    account TEXT NOT NULL,
+    account_type TEXT,
+    captured_on TEXT NOT NULL,
+    balance REAL NOT NULL,
+    PRIMARY KEY (account, captured_on)
+) WITHOUT ROWID
+"""
+
+
+def history_path_for(output_file):
+    """History database stored next to the output workbook, so each household keeps its own"""
+    root, _ = os.path.splitext(output_file)
+    return f"{root}.history.sqlite"
+
+
+class BalanceHistory:
+    """Per-account balance snapshots, at most one per account and day"""
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, balances, captured_on=None):
+        """Store (account, account type, balance) rows; a rerun on the same day replaces that day's row"""
+        captured_on = (captured_on or date.today()).isoformat()
+        rows = [(str(account), None if pd.isna(account_type) else str(account_type), captured_on, float(balance))
+                for account, account_type, balance in balances if pd.notna(balance)]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO balances (account, account_type, captured_on, balance) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, captured_on) DO UPDATE SET "
+                "account_type = excluded.account_type, balance = excluded.balance", rows)
+        return len(rows)
+
+    def balance_as_of(self, as_of):
+        """{account: (captured_on, balance)} for the latest snapshot on or before a date"""
+        cursor = self.connection.execute(
+            "SELECT b.account, b.captured_on, b.balance FROM balances b "
+            "WHERE b.captured_on = (SELECT MAX(captured_on) FROM balances "
+            "                       WHERE account = b.account AND captured_on <= ?)",
+            (as_of.isoformat(),))
+        return {account: (date.fromisoformat(captured_on), balance)
+                for account, captured_on, balance in cursor}
+
+    def last_changed(self, as_of):
+        """{account: date} on which each account's balance as of a date was first captured"""
+        cursor = self.connection.execute(
+            "SELECT b.account, MIN(b.captured_on) FROM balances b "
+            "JOIN balances latest ON latest.account = b.account AND latest.captured_on = "
+            "     (SELECT MAX(captured_on) FROM balances WHERE account = b.account AND captured_on <= ?) "
+            "WHERE b.captured_on <= latest.captured_on AND b.captured_on > COALESCE("
+            "     (SELECT MAX(captured_on) FROM balances "
+            "      WHERE account = b.account AND captured_on < latest.captured_on "
+            "        AND balance != latest.balance), '') "
+            "GROUP BY b.account",
+            (as_of.isoformat(),))
+        return {account: date.fromisoformat(captured_on) for account, captured_on in cursor}
+
+    def changes(self, window_days=None, as_of=None):
+        """Current balance, earlier balance, change amount and change % per account
+
+        The earlier balance is the one held window_days before as_of, or the
+        last snapshot from an earlier day when no window is given.
+        """
+        as_of = as_of or date.today()
+        current = self.balance_as_of(as_of)
+        previous = self.balance_as_of(as_of - timedelta(days=window_days or 1))
+        updated = self.last_changed(as_of)
+        frame = pd.DataFrame({
+            'Current Balance': {account: balance for account, (_, balance) in current.items()},
+            'Previous Balance': {account: balance for account, (_, balance) in previous.items()},
+            'Previous Date': {account: captured_on for account, (captured_on, _) in previous.items()},
+            'Last Updated': updated
+        }, columns=['Current Balance', 'Previous Balance', 'Previous Date', 'Last Updated'])
+        frame['Change Amount'] = frame['Current Balance'] - frame['Previous Balance']
+        frame['Change %'] = (frame['Change Amount'] / frame['Previous Balance'].abs()).where(
+            frame['Previous Balance'] != 0)
+        return frame
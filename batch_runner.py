@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Batch mode for the Financial Dashboard streamliner
+Streamlines many source workbooks with a bounded process pool; each file runs
+in isolation, so one bad workbook is reported as failed without stopping the
+rest, and a JSON report records per-file timings and row counts
+"""
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+OUTPUT_SUFFIX = ' - Streamlined'
+
+
+def find_workbooks(patterns):
+    """Expand directories and glob patterns into a sorted list of source workbooks"""
+    sources = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.xlsx'))
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for path in matches:
+            name = os.path.basename(path)
+            # Skip Excel lock files and earlier streamlined outputs
+            if name.startswith('~$') or os.path.splitext(name)[0].endswith(OUTPUT_SUFFIX):
+                continue
+            path = os.path.abspath(path)
+            if path not in sources:
+                sources.append(path)
+    return sorted(sources)
+
+
+def plan_outputs(sources, output_dir=None):
+    """(source, output) pairs, with outputs next to the sources unless output_dir is given"""
+    pairs = []
+    used = set()
+    for source in sources:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        directory = output_dir or os.path.dirname(source)
+        output = os.path.join(directory, f"{stem}{OUTPUT_SUFFIX}.xlsx")
+        suffix = 2
+        while output in used:
+            output = os.path.join(directory, f"{stem}{OUTPUT_SUFFIX} ({suffix}).xlsx")
+            suffix += 1
+        used.add(output)
+        pairs.append((source, output))
+    return pairs
+
+
+def streamline_one(streamliner_class, source, output, options):
+    """Worker entry point: streamline one workbook and report how it went, never raising"""
+    result = {'source': source, 'output': output, 'status': 'ok', 'error': None}
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            streamliner = streamliner_class(source, output, **options)
+            streamliner.create_streamlined_dashboard()
+        result['source_rows'] = {sheet: int(df.shape[0]) for sheet, df in streamliner.data.items()}
+        result['total_rows'] = sum(result['source_rows'].values())
+        result['load_seconds'] = round(streamliner.load_open_seconds + sum(streamliner.load_timings.values()), 4)
+        result['reader_engines'] = sorted(set(streamliner.load_engines.values()))
+        result['output_bytes'] = os.path.getsize(output) if os.path.exists(output) else None
+    except Exception as e:
+        result.update(status='failed', error=f"{type(e).__name__}: {e}",
+                      traceback=traceback.format_exc(),
+                      log_tail=log.getvalue().splitlines()[-20:])
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def crashed_result(source, output, error):
+    return {'source': source, 'output': output, 'status': 'failed', 'seconds': None,
+            'error': f"Worker process died: {error}"}
+
+
+def run_tasks(streamliner_class, tasks, jobs):
+    """Run (source, output, options) tasks in a pool; return results and the tasks lost to a dead worker"""
+    results, lost = [], []
+    with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(tasks)))) as executor:
+        futures = {executor.submit(streamline_one, streamliner_class, *task): task for task in tasks}
+        for future in as_completed(futures):
+            source, output, _ = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                lost.append(futures[future])
+                continue
+            print(f"  {'✓' if result['status'] == 'ok' else '✗'} {os.path.basename(source)} "
+                  f"({result['seconds']:.2f}s){'' if result['error'] is None else ' - ' + result['error']}")
+            results.append(result)
+    return results, lost
+
+
+def run_batch(streamliner_class, tasks, jobs=1, report_path=None):
+    """Streamline every (source, output, options) task and write the summary report"""
+    print(f"Streamlining {len(tasks)} workbooks with {max(1, min(jobs, len(tasks)))} workers...")
+    start = time.perf_counter()
+    results, lost = run_tasks(streamliner_class, tasks, jobs) if tasks else ([], [])
+
+    # A crashed worker takes the whole pool down; retry those files one at a time to find the culprit
+    for task in lost:
+        retried, still_lost = run_tasks(streamliner_class, [task], 1)
+        results += retried
+        results += [crashed_result(source, output, 'process terminated abruptly')
+                    for source, output, _ in still_lost]
+
+    order = {task[0]: index for index, task in enumerate(tasks)}
+    results.sort(key=lambda result: order[result['source']])
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'jobs': jobs,
+        'files': len(results),
+        'succeeded': sum(result['status'] == 'ok' for result in results),
+        'failed': sum(result['status'] != 'ok' for result in results),
+        'total_seconds': round(time.perf_counter() - start, 4),
+        'results': results
+    }
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+    print(f"\n✓ {report['succeeded']} of {report['files']} workbooks streamlined "
+          f"in {report['total_seconds']:.2f}s")
+    for result in results:
+        if result['status'] != 'ok':
+            print(f"  ✗ {result['source']}: {result['error']}")
+    if report_path:
+        print(f"  Report saved to: {report_path}")
+    return report
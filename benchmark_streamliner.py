@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the Financial Dashboard streamliner
+Generates synthetic 13-tab source workbooks at configurable sizes, runs the
+streamliner end to end and records per-phase wall time and traced memory
+peaks (from the instrumentation spans) and the peak RSS of each run as JSON
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_WORKDIR = os.path.join(os.path.expanduser('~'), '.cache', 'financial_dashboard', 'bench')
+
+# Raw categories as they appear in the source sheets, including a few unmapped ones
+PERSONAL_CATEGORIES = ['books', 'Admin', 'career', 'Clothing', 'digital subscriptions', 'education',
+                       'finance', 'Golf', 'grooming', 'health', 'hobbies', 'personal',
+                       'Restaurants', 'transportation', 'therapy', 'gifts']
+SHARED_CATEGORIES = ['Amelia', 'baby', 'car', 'going out', 'Groceries', 'home', 'household goods',
+                     'rent or mortgage', 'travel', 'utilities', 'insurance', 'misc']
+COMPANIES = ['Costco', 'Amazon', 'Target', 'Shell', 'Trader Joes', 'Whole Foods', 'Netflix',
+             'Comcast', 'PG&E', 'Delta', 'Uber', 'CVS', 'Home Depot', 'Chewy', 'Local Cafe']
+DEBTS = {
+    'Car': (28000.0, 0.059, 540.0),
+    'Credit Line': (12000.0, 0.112, 400.0),
+    'Home Energy': (18000.0, 0.039, 210.0),
+    'Mortgage': (420000.0, 0.0325, 2300.0)
+}
+
+
+def peak_rss_mb(who=None):
+    """Peak resident set size of this process (or its children) in MB"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(who if who is not None else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+
+def synthetic_expenses(rng, n, categories, start, months):
+    """Random expense detail rows spread over the given months"""
+    days = rng.integers(0, months * 30, n)
+    frame = pd.DataFrame({
+        'date': start + pd.to_timedelta(days, unit='D'),
+        'company': rng.choice(COMPANIES, n),
+        'category': rng.choice(categories, n),
+        'price': rng.gamma(2.0, 40.0, n).round(2)
+    })
+    return frame.sort_values('date', ignore_index=True)
+
+
+def debt_schedule(balance, rate, payment, start, months):
+    """Monthly payment history for one debt"""
+    rows = []
+    for month in pd.date_range(start, periods=months, freq='MS'):
+        interest = round(balance * rate / 12, 2)
+        principal = min(payment - interest, balance)
+        balance = round(balance - principal, 2)
+        rows.append({'date': month, 'payment': payment, 'interest': interest,
+                     'principal': principal, 'current debt amount': balance})
+    return pd.DataFrame(rows)
+
+
+def generate_synthetic_workbook(path, transactions, months=120, seed=0):
+    """Write a source workbook with the 13 sheets the streamliner expects"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2016-01-01')
+    month_starts = pd.date_range(start, periods=months, freq='MS')
+
+    personal = synthetic_expenses(rng, transactions // 2, PERSONAL_CATEGORIES, start, months)
+    shared = synthetic_expenses(rng, transactions - transactions // 2, SHARED_CATEGORIES, start, months)
+
+    personal_monthly = personal.groupby(personal['date'].dt.to_period('M'))['price'].sum()
+    shared_monthly = shared.groupby(shared['date'].dt.to_period('M'))['price'].sum()
+    periods = month_starts.to_period('M')
+    net_pay = rng.normal(7200, 300, months).round(2)
+
+    sheets = {
+        'Income vs Expenses': pd.DataFrame({
+            'Start Date': month_starts,
+            'End Date': month_starts + pd.offsets.MonthEnd(0),
+            'Net Pay': net_pay,
+            'Personal Expenses': personal_monthly.reindex(periods, fill_value=0).values.round(2),
+            '50% Shared Expenses': (shared_monthly.reindex(periods, fill_value=0).values * 0.5).round(2)
+        }),
+        'Personal Expenses': personal.pivot_table(index=personal['date'].dt.to_period('M').astype(str),
+                                                  columns='category', values='price',
+                                                  aggfunc='sum', fill_value=0).reset_index(),
+        'Personal Expenses Detail': personal,
+        'Shared Expenses': shared.pivot_table(index=shared['date'].dt.to_period('M').astype(str),
+                                              columns='category', values='price',
+                                              aggfunc='sum', fill_value=0).reset_index(),
+        'Shared Expenses Detail': shared,
+        'Income': pd.DataFrame({'date': month_starts,
+                                'Gross Pay': (net_pay * 1.35).round(2),
+                                'Net Pay': net_pay}),
+        'Account Balances': pd.DataFrame({
+            'Asset Category': ['Checking', 'Savings', 'Brokerage', 'Retirement', 'HSA'],
+            'Amount': rng.uniform(5000, 250000, 5).round(2),
+            '3-Month Change': rng.normal(0.01, 0.03, 5).round(4)
+        }),
+        'Katherine Assets': pd.DataFrame({
+            'Name': ['Katherine Checking', 'Katherine 401k', 'Katherine Roth IRA'],
+            'Type': ['Cash', 'Retirement', 'Retirement'],
+            'Balance': rng.uniform(2000, 150000, 3).round(2)
+        }),
+        'Debt Summary': pd.DataFrame({
+            'Debt Type': list(DEBTS),
+            'Balance': [balance for balance, _, _ in DEBTS.values()],
+            'Monthly Payment': [payment for _, _, payment in DEBTS.values()],
+            'Interest Rate': [rate for _, rate, _ in DEBTS.values()]
+        })
+    }
+    for name, (balance, rate, payment) in DEBTS.items():
+        sheets[name] = debt_schedule(balance, rate, payment, start, min(months, 48))
+
+    with pd.ExcelWriter(path) as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return path
+
+
+def synthetic_workbook_path(workdir, transactions):
+    """Generate (once) and return the synthetic workbook for a size"""
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, f"synthetic_{transactions}.xlsx")
+    if not os.path.exists(path):
+        print(f"Generating synthetic workbook with {transactions:,} transactions...")
+        generate_synthetic_workbook(path, transactions)
+    return path
+
+
+def run_single(source_file, output_file, streaming=False, use_cache=False, engine=None,
+               writer='openpyxl'):
+    """Run the streamliner end to end and return timing and memory per phase
+
+    Phases are the top-level instrumentation spans of create_streamlined_dashboard;
+    each carries its own tracemalloc peak. peak_rss_mb is the high-water mark of
+    the whole run.
+    """
+    from create_streamlined_dashboard_fixed import FinancialDashboardStreamliner
+    from instrumentation import Instrumentation
+
+    instrumentation = Instrumentation(trace_memory=True)
+    streamliner = FinancialDashboardStreamliner(source_file, output_file, streaming=streaming,
+                                                use_cache=use_cache, instrumentation=instrumentation,
+                                                reader_engine=engine, writer=writer)
+    total_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        streamliner.create_streamlined_dashboard()
+    total_seconds = time.perf_counter() - total_start
+
+    phases = [{'phase': record['name'], 'tab': record.get('tab'), 'seconds': round(record['duration_s'], 4),
+               'tracemalloc_peak_mb': record['tracemalloc_peak_mb']}
+              for record in instrumentation.records if record['parent'] == 'create_streamlined_dashboard']
+    rows = {sheet: int(df.shape[0]) for sheet, df in streamliner.data.items()}
+    return {
+        'phases': phases,
+        'total_seconds': round(total_seconds, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'children_peak_rss_mb': peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        'open_seconds': round(streamliner.load_open_seconds, 4),
+        'sheet_load_seconds': {sheet: round(seconds, 4)
+                               for sheet, seconds in streamliner.load_timings.items()},
+        'sheet_engines': streamliner.load_engines,
+        'source_rows': rows,
+        'output_bytes': os.path.getsize(output_file)
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def sheet_speedup(baseline, result):
+    """Per-sheet parse speedup of a run over the baseline run of the same size"""
+    speedup = {}
+    for sheet, seconds in result['sheet_load_seconds'].items():
+        base = baseline['sheet_load_seconds'].get(sheet)
+        if base is not None and seconds > 0:
+            speedup[sheet] = round(base / seconds, 2)
+    return speedup
+
+
+def run_benchmarks(sizes, workdir=DEFAULT_WORKDIR, streaming=False, use_cache=False, engines=None,
+                   writer='openpyxl'):
+    """Benchmark each size (and reader engine) in a fresh process so peak RSS is not shared between runs
+
+    With several engines the first is the baseline, and the others report
+    their per-sheet parse speedup over it.
+    """
+    engines = engines or ['auto']
+    results = []
+    for transactions in sizes:
+        source_file = synthetic_workbook_path(workdir, transactions)
+        output_file = os.path.join(workdir, f"streamlined_{transactions}.xlsx")
+        baseline = None
+        for engine in engines:
+            print(f"Benchmarking {transactions:,} transactions ({engine} reader)...")
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_single, source_file, output_file,
+                                         streaming, use_cache, engine, writer).result()
+            result['transactions'] = transactions
+            result['engine'] = engine
+            if baseline is None:
+                baseline = result
+            else:
+                result['baseline_engine'] = baseline['engine']
+                result['sheet_speedup'] = sheet_speedup(baseline, result)
+            results.append(result)
+            print(f"  ✓ {result['total_seconds']:.2f}s, peak RSS {result['peak_rss_mb']:.0f} MB")
+            for sheet, speedup in result.get('sheet_speedup', {}).items():
+                print(f"    {sheet}: {speedup:.1f}x faster than {baseline['engine']}")
+
+    return {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'settings': {'streaming': streaming, 'use_cache': use_cache, 'engines': engines,
+                     'writer': writer},
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='transaction counts to benchmark')
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR,
+                        help='where synthetic workbooks and outputs are kept')
+    parser.add_argument('--output', default='bench_results.json', help='JSON results file')
+    parser.add_argument('--streaming', action='store_true', help='use the streaming writer')
+    parser.add_argument('--cache', action='store_true', help='read source sheets through the Parquet cache')
+    parser.add_argument('--writer', choices=['openpyxl', 'xlsxwriter'], default='openpyxl',
+                        help='output backend')
+    parser.add_argument('--engines', nargs='+', choices=['auto', 'calamine', 'openpyxl'], default=['auto'],
+                        help='reader engines to compare; the first is the baseline for per-sheet speedups')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.workdir, args.streaming, args.cache, args.engines,
+                            args.writer)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Benchmark results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
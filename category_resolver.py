@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Category normalisation for the Financial Dashboard scripts
+Raw category values are resolved once per distinct value and broadcast back
+to every row, with an optional prefix or fuzzy fallback for unmapped values
+"""
+import contextlib
+import difflib
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+DEFAULT_MEMO_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'financial_dashboard',
+                                 'category_memo.json')
+FALLBACK_MODES = (None, 'prefix', 'fuzzy')
+
+
+@contextlib.contextmanager
+def memo_lock(memo_path):
+    """Hold an exclusive lock on the memo file's lock file where the platform supports it"""
+    if not HAS_FCNTL:
+        yield
+        return
+    with open(memo_path + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class CategoryResolver:
+    """Memoised raw category -> standardized category lookup
+
+    With a fallback, successful matches are kept in a memo file shared across
+    runs unless persist is False.
+    """
+    def __init__(self, mapping, fallback=None, default='Other', cutoff=0.8, memo_path=None, persist=True):
+        if fallback not in FALLBACK_MODES:
+            raise ValueError(f"Unknown category fallback '{fallback}' (expected one of {FALLBACK_MODES})")
+        self.mapping = mapping
+        self.fallback = fallback
+        self.default = default
+        self.cutoff = cutoff
+        self.memo_path = memo_path or DEFAULT_MEMO_PATH
+        self.persist = persist
+        self.memo = {}
+        self.unmapped = set()
+        self._keys = sorted(mapping, key=len, reverse=True)
+        self._memo_key = self._settings_key()
+        if self.fallback and self.persist:
+            self._load_memo()
+
+    def _settings_key(self):
+        payload = json.dumps([sorted(self.mapping.items()), self.fallback, self.cutoff, self.default])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _load_memo(self):
+        """Reuse fallback matches from earlier runs with the same mapping and settings"""
+        try:
+            with open(self.memo_path, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Older memo files also stored unmatched values; match those again so they are reported
+        self.memo.update({key: value for key, value in stored.get(self._memo_key, {}).items()
+                          if value != self.default})
+
+    def save(self):
+        """Persist fallback matches so later runs skip the matching step"""
+        if not self.fallback or not self.persist:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.memo_path)), exist_ok=True)
+        # Batch workers save concurrently: merge under a lock, and swap in a complete file
+        with memo_lock(self.memo_path):
+            try:
+                with open(self.memo_path, 'r') as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                stored = {}
+            # Unmatched values are left out, so every run still reports them as unmapped
+            stored.setdefault(self._memo_key, {}).update({key: value for key, value in self.memo.items()
+                                                          if key not in self.mapping and key not in self.unmapped})
+            tmp_path = f"{self.memo_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(stored, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.memo_path)
+
+    def _match(self, key):
+        """Fallback match for a key missing from the mapping"""
+        cleaned = ' '.join(key.split())
+        if cleaned in self.mapping:
+            return self.mapping[cleaned]
+        for candidate in self._keys:
+            if cleaned.startswith(candidate) or (len(cleaned) >= 3 and candidate.startswith(cleaned)):
+                return self.mapping[candidate]
+        if self.fallback == 'fuzzy':
+            matches = difflib.get_close_matches(cleaned, self._keys, n=1, cutoff=self.cutoff)
+            if matches:
+                return self.mapping[matches[0]]
+        return None
+
+    def resolve_one(self, value):
+        """Standardized category for a single raw value"""
+        if pd.isna(value):
+            return self.default
+        key = str(value).lower()
+        try:
+            return self.memo[key]
+        except KeyError:
+            pass
+        result = self.mapping.get(key)
+        if result is None and self.fallback:
+            result = self._match(key)
+        if result is None:
+            self.unmapped.add(key)
+            result = self.default
+        self.memo[key] = result
+        return result
+
+    def resolve(self, categories):
+        """Standardize a whole column: factorise, resolve each distinct value once, broadcast back"""
+        codes, uniques = pd.factorize(categories)
+        lookup = np.array([self.resolve_one(value) for value in uniques] + [self.default], dtype=object)
+        # Missing values get code -1, which picks the trailing default
+        return pd.Series(lookup[codes], index=categories.index)
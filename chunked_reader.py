@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Out-of-core sheet reader for the Financial Dashboard streamliner
+Streams a sheet through openpyxl's read-only iter_rows and yields it as
+DataFrames of a fixed number of rows, so memory is bounded by the chunk size
+instead of by the length of the transaction history
+"""
+import os
+from itertools import islice
+import pandas as pd
+from openpyxl import load_workbook
+
+DEFAULT_CHUNK_ROWS = 50000
+
+# Text cells pd.read_excel reads as missing by default
+NA_STRINGS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+              '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def header_names(header):
+    """Column names for a header row, the way pd.read_excel names them"""
+    header = list(header)
+    while header and header[-1] is None:
+        header.pop()
+    names, seen = [], {}
+    for i, name in enumerate(header):
+        name = f"Unnamed: {i}" if name is None else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def source_signature(file_path):
+    """Path, mtime and size of a workbook, standing in for sheet fingerprints in cache keys"""
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    return {'path': file_path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def iter_sheet_chunks(file_path, sheet, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield a sheet as DataFrames of at most chunk_rows rows, indexed by data row number
+
+    The first row is the header, and the same text cells count as missing,
+    as with pd.read_excel. Each chunk has its column types inferred on its
+    own; a sheet missing from the workbook yields nothing.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        if sheet not in wb.sheetnames:
+            return
+        ws = wb[sheet]
+        # Saved dimensions can be stale; let iter_rows find the real extent
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = header_names(header)
+        width = len(columns)
+
+        start = 0
+        while True:
+            block = [row[:width] + (None,) * (width - len(row)) for row in islice(rows, chunk_rows)]
+            if not block:
+                break
+            frame = pd.DataFrame.from_records(block, columns=columns,
+                                              index=pd.RangeIndex(start, start + len(block)))
+            for column in frame.select_dtypes(include=['object', 'string']).columns:
+                frame[column] = frame[column].where(~frame[column].isin(NA_STRINGS))
+            yield frame.infer_objects()
+            start += len(block)
+    finally:
+        wb.close()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Column auto-fit shared by the streamliner and the streaming writer
+"""
+
+
+def value_length(value, length_cache):
+    """Displayed text length of one cell value; floats as the currency format shows them
+
+    The text length of repeated non-string values is looked up in length_cache.
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, float):
+        # Amounts are shown with thousands separators, two decimals and a currency sign
+        key = (float, value)
+        try:
+            return length_cache[key]
+        except KeyError:
+            length = length_cache[key] = len(f"{value:,.2f}") + 1
+            return length
+    key = (value.__class__, value)
+    try:
+        return length_cache[key]
+    except KeyError:
+        length = length_cache[key] = len(str(value))
+        return length
+    except TypeError:
+        return len(str(value))
+
+
+def fitted_widths(lengths, max_width=30, min_width=10):
+    """{column index: width} for measured {column index: text length}"""
+    return {column: max(min(length + 2, max_width), min_width)
+            for column, length in lengths.items()}
+
+
+def measure_column_widths(rows, max_width=30, min_width=10):
+    """Return {column index: width} from one row-major sweep over cell values
+
+    rows yields sequences of cell values, so MergedCell positions (always None)
+    are skipped. A column stops being measured once it reaches max_width.
+    """
+    cap = max_width - 2
+    lengths = {}
+    capped = set()
+    length_cache = {}
+    for row in rows:
+        for column, value in enumerate(row, 1):
+            if value is None or column in capped:
+                continue
+            length = value_length(value, length_cache)
+            if length > lengths.get(column, 0):
+                lengths[column] = length
+                if length >= cap:
+                    capped.add(column)
+
+    return fitted_widths(lengths, max_width, min_width)
+
+
+def measure_frame_widths(frames, header=(), max_width=30, min_width=10):
+    """Return {column index: width} for a header row followed by rows appended from DataFrames
+
+    Gives the widths measure_column_widths would fit from the same rows, but
+    measures each column once per distinct value rather than cell by cell.
+    """
+    length_cache = {}
+    lengths = {column: value_length(value, length_cache)
+               for column, value in enumerate(header, 1) if value is not None}
+    for frame in frames:
+        for column, (_, series) in enumerate(frame.items(), 1):
+            if lengths.get(column, 0) >= max_width - 2:
+                continue
+            if series.dtype.kind == 'f':
+                # The displayed length only grows with magnitude, so the extremes are the longest amounts
+                values = [value for value in (series.min(), series.max()) if value == value]
+                if series.isna().any():
+                    values.append(float('nan'))
+            else:
+                values = series.drop_duplicates()
+            for value in values:
+                if value is not None:
+                    lengths[column] = max(lengths.get(column, 0), value_length(value, length_cache))
+
+    return fitted_widths(lengths, max_width, min_width)
@@ -6,17 +6,112 @@ Converting from 13 tabs to 7 tabs with improved organization and standardized ca
 import pandas as pd
 import openpyxl
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Alignment, Border, Side
+from openpyxl.utils import get_column_letter
 from datetime import datetime, date
 import numpy as np
+import os
+import sys
+import argparse
+from workbook_loader import WorkbookLoader, format_bytes
+from streaming_writer import StreamingWorkbook
+from xlsxwriter_backend import HAS_XLSXWRITER, XlsxWriterWorkbook
+from column_widths import measure_column_widths, measure_frame_widths
+from row_buffer import RowBuffer
+from instrumentation import Instrumentation, count_cells
+from category_resolver import CategoryResolver
+from monthly_cube import MonthlyCube, cube_key
+from debt_projection import project, balance_schedule
+from balance_history import BalanceHistory, history_path_for
+from typed_cells import TypedCellWriter
+from style_registry import style_registry, header_style_name
+from sheet_manifest import SheetManifest, manifest_path_for
+from batch_runner import find_workbooks, plan_outputs, run_batch
+from chunked_reader import iter_sheet_chunks, source_signature
+from sheet_schemas import SOURCE_SCHEMAS, SchemaDriftError
 
 class FinancialDashboardStreamliner:
-    def __init__(self, original_file_path, output_file_path):
+    # Builder method for each output tab, in workbook order
+    TAB_BUILDERS = {
+        'Dashboard': 'create_dashboard_tab',
+        'Transaction Log': 'create_transaction_log_tab',
+        'Monthly Summary': 'create_monthly_summary_tab',
+        'Account Balances': 'create_account_balances_tab',
+        'Debt Tracking': 'create_debt_tracking_tab',
+        'Budget Planning': 'create_budget_planning_tab',
+        'Category Analysis': 'create_category_analysis_tab'
+    }
+    
+    # Output backends: openpyxl (in memory, or write-only with streaming) and constant-memory XlsxWriter
+    WRITERS = ('openpyxl', 'xlsxwriter')
+    
+    # Expense detail sheets aggregated into the monthly cube, with the share of each amount counted
+    EXPENSE_SHEETS = {
+        'Personal Expenses Detail': ('Personal', 1),
+        'Shared Expenses Detail': ('Shared', 0.5)
+    }
+    
+    # Per-debt payment history sheets, and the extra monthly amounts tried in the payoff scenarios
+    DEBT_SHEETS = ['Car', 'Credit Line', 'Home Energy', 'Mortgage']
+    PAYOFF_EXTRA_PAYMENTS = [0, 100, 250, 500, 1000]
+    
+    # Source sheets each output tab reads from self.data
+    TAB_SOURCE_SHEETS = {
+        'Dashboard': ['Account Balances', 'Debt Summary', 'Income',
+                      'Personal Expenses Detail', 'Shared Expenses Detail'],
+        'Transaction Log': ['Personal Expenses Detail', 'Shared Expenses Detail'],
+        'Monthly Summary': ['Income vs Expenses', 'Income',
+                            'Personal Expenses Detail', 'Shared Expenses Detail'],
+        'Account Balances': ['Account Balances', 'Katherine Assets'],
+        'Debt Tracking': ['Debt Summary', 'Car', 'Credit Line', 'Home Energy', 'Mortgage'],
+        'Budget Planning': ['Personal Expenses Detail', 'Shared Expenses Detail'],
+        'Category Analysis': ['Personal Expenses Detail', 'Shared Expenses Detail']
+    }
+    
+    # Manifest entry for the balance history changes shown on Account Balances
+    HISTORY_SOURCE = '(balance history)'
+    
+    def __init__(self, original_file_path, output_file_path, streaming=False, incremental=False,
+                 use_cache=True, instrumentation=None, category_fallback=None,
+                 budget_file=None, balance_history=True, history_path=None, change_window_days=None,
+                 tabs=None, chunk_rows=None, reader_engine=None, writer='openpyxl'):
         self.original_file = original_file_path
         self.output_file = output_file_path
+        self.writer = self.resolve_writer(writer)
+        # Out-of-core runs write through a streaming writer, or the output would hold every row anyway
+        self.streaming = streaming or chunk_rows is not None or writer == 'xlsxwriter'
+        self.incremental = incremental
+        self.use_cache = use_cache
+        self.instrumentation = instrumentation or Instrumentation()
         self.data = {}
+        self.load_timings = {}
+        self.load_open_seconds = 0.0
         self.category_mapping = self.create_category_mapping()
-        
+        self.category_resolver = CategoryResolver(self.category_mapping, fallback=category_fallback,
+                                                  persist=use_cache)
+        self.cube = None
+        self.budget_file = budget_file
+        self.balance_history = balance_history
+        self.history_path = history_path or history_path_for(output_file_path)
+        self.change_window_days = change_window_days
+        self.balance_changes = None
+        self.tabs = tabs
+        self.chunk_rows = chunk_rows
+        self.reader_engine = reader_engine
+        self.load_engines = {}
+        self.load_memory = {}
+        self.source_sheet_names = []
+        self.chunked_rows = {}
+        
+    def resolve_writer(self, writer):
+        """Output backend to use; xlsxwriter falls back to the openpyxl writer when it is not installed"""
+        if writer not in self.WRITERS:
+            raise ValueError(f"Unknown writer '{writer}' (expected one of {self.WRITERS})")
+        if writer == 'xlsxwriter' and not HAS_XLSXWRITER:
+            print("  xlsxwriter is not installed; writing with openpyxl in streaming mode")
+            return 'openpyxl'
+        return writer
+    
     def create_category_mapping(self):
         """Create mapping from 30+ categories to 15 standardized categories"""
         return {
@@ -52,66 +147,169 @@ class FinancialDashboardStreamliner:
         }
     
     def auto_fit_columns(self, ws, max_width=30):
-        """Auto-fit columns while handling merged cells"""
-        for column_cells in ws.columns:
-            max_length = 0
-            column_letter = None
-            for cell in column_cells:
-                try:
-                    # Skip merged cells
-                    if hasattr(cell, 'coordinate') and cell.coordinate:
-                        if column_letter is None:
-                            column_letter = cell.column_letter
-                        
-                        if cell.value is not None and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                except Exception:
-                    pass
-            
-            if column_letter and max_length > 0:
-                adjusted_width = min(max_length + 2, max_width)
-                ws.column_dimensions[column_letter].width = max(adjusted_width, 10)
+        """Auto-fit columns in one row-major sweep, skipping merged cells"""
+        if isinstance(ws, RowBuffer):
+            # Streaming sheets size their columns when rows are written out
+            ws.auto_fit(max_width)
+            return
+        
+        with self.instrumentation.span('auto_fit_columns', tab=ws.title) as span:
+            widths = measure_column_widths(ws.iter_rows(values_only=True), max_width)
+            for column, width in widths.items():
+                ws.column_dimensions[get_column_letter(column)].width = width
+            span['cells'] = count_cells(ws)
+    
+    def selected_tabs(self):
+        """Tabs to build: the requested ones when the previous output can be reused, else all"""
+        all_tabs = list(self.TAB_BUILDERS)
+        if self.tabs is None:
+            return all_tabs
+        unknown = set(self.tabs) - set(all_tabs)
+        if unknown:
+            raise ValueError(f"Unknown tabs: {', '.join(sorted(unknown))} (expected some of {all_tabs})")
+        if self.streaming or not os.path.exists(self.output_file):
+            print("  No previous output to rebuild selected tabs in; building all tabs")
+            return all_tabs
+        return [tab for tab in all_tabs if tab in self.tabs]
+    
+    def required_sheets(self, tabs=None):
+        """Return the source sheets needed to build the given output tabs"""
+        if tabs is None:
+            tabs = self.TAB_SOURCE_SHEETS.keys()
+        sheets = []
+        for tab in tabs:
+            for sheet in self.TAB_SOURCE_SHEETS[tab]:
+                if sheet not in sheets:
+                    sheets.append(sheet)
+        return sheets
     
-    def load_original_data(self):
-        """Load all sheets from the original Excel file"""
+    def load_original_data(self, sheets=None):
+        """Load sheets from the original Excel file (all sheets by default) in a single open"""
         print("Loading original data...")
         
-        sheet_names = pd.ExcelFile(self.original_file).sheet_names
-        for sheet in sheet_names:
-            try:
-                self.data[sheet] = pd.read_excel(self.original_file, sheet_name=sheet)
-                print(f"  ✓ Loaded '{sheet}' ({self.data[sheet].shape[0]} rows)")
-            except Exception as e:
-                print(f"  ✗ Error loading '{sheet}': {e}")
+        with self.instrumentation.span('load_original_data') as span:
+            with WorkbookLoader(self.original_file, use_cache=self.use_cache,
+                                engine=self.reader_engine, schemas=SOURCE_SCHEMAS) as loader:
+                self.source_sheet_names = list(loader.sheet_names)
+                if self.chunk_rows:
+                    # Expense detail sheets are streamed in row chunks by the stages that read them
+                    loader.validate_schemas([sheet for sheet in loader.select_sheets(sheets)
+                                             if sheet in self.EXPENSE_SHEETS])
+                    sheets = [sheet for sheet in loader.select_sheets(sheets)
+                              if sheet not in self.EXPENSE_SHEETS]
+                self.data.update(loader.load(sheets))
+                self.load_timings = dict(loader.timings)
+                self.load_open_seconds = loader.open_seconds
+                self.load_engines = dict(loader.sheet_engines)
+                self.load_memory = dict(loader.memory)
+                span['engine'] = loader.engine
+                span['sheet_engines'] = self.load_engines
+                span['sheet_memory'] = self.load_memory
+            span['rows'] = sum(df.shape[0] for df in self.data.values())
+            span['sheets'] = len(self.data)
+            span['sheet_seconds'] = {sheet: round(seconds, 6)
+                                     for sheet, seconds in self.load_timings.items()}
+            span['open_seconds'] = round(self.load_open_seconds, 6)
+        
+        total = self.load_open_seconds + sum(self.load_timings.values())
+        print(f"  Parsed {len(self.data)} sheets in {total:.2f}s ({span['engine']})")
+        parsed = [memory for memory in self.load_memory.values() if memory['before'] is not None]
+        if parsed:
+            print(f"  Compacted in memory: {format_bytes(sum(memory['before'] for memory in parsed))} → "
+                  f"{format_bytes(sum(memory['after'] for memory in parsed))}")
     
     def create_workbook_structure(self):
         """Create new workbook with 7 streamlined tabs"""
         print("Creating new workbook structure...")
         
-        wb = Workbook()
-        
-        # Remove default sheet
-        wb.remove(wb.active)
+        if self.writer == 'xlsxwriter':
+            # Constant-memory XlsxWriter workbook, written straight to the output file
+            wb = XlsxWriterWorkbook(self.output_file)
+        elif self.streaming:
+            # Write-only workbook that flushes rows as the tabs are built
+            wb = StreamingWorkbook()
+        else:
+            wb = Workbook()
+            
+            # Remove default sheet
+            wb.remove(wb.active)
         
         # Create the 7 new sheets in order
-        tab_names = [
-            'Dashboard',
-            'Transaction Log',
-            'Monthly Summary',
-            'Account Balances',
-            'Debt Tracking',
-            'Budget Planning',
-            'Category Analysis'
-        ]
-        
-        for name in tab_names:
+        for name in self.TAB_BUILDERS:
             wb.create_sheet(title=name)
             print(f"  ✓ Created tab: {name}")
         
         return wb
     
+    def category_settings(self):
+        """Settings that change how expense rows are categorised"""
+        return {'category_mapping': self.category_mapping,
+                'category_fallback': self.category_resolver.fallback}
+    
+    def plan_incremental_build(self):
+        """Fingerprint the loaded sheets and work out which tabs changed since the last run"""
+        settings = dict(self.category_settings(), budget_file=self.budget_signature())
+        data = dict(self.data)
+        if self.balance_history:
+            # The history's changes feed Account Balances just like a source sheet
+            data[self.HISTORY_SOURCE] = self.account_balance_changes()
+        manifest = SheetManifest.from_data(manifest_path_for(self.output_file), data, settings)
+        all_tabs = list(self.TAB_BUILDERS)
+        
+        if self.streaming:
+            print("  Incremental rebuild is not available in streaming mode; rebuilding all tabs")
+            return manifest, all_tabs
+        
+        previous = SheetManifest.load(manifest.path)
+        if not previous.sheets or previous.settings != manifest.settings:
+            return manifest, all_tabs
+        
+        try:
+            previous_wb = load_workbook(self.output_file, read_only=True)
+            previous_tabs = previous_wb.sheetnames
+            previous_wb.close()
+        except Exception:
+            return manifest, all_tabs
+        if set(previous_tabs) != set(all_tabs):
+            return manifest, all_tabs
+        
+        changed = manifest.changed_sheets(previous)
+        tabs = [tab for tab in all_tabs if changed & self.tab_inputs(tab)]
+        return manifest, tabs
+    
+    def tab_inputs(self, tab):
+        """Manifest entries a tab is built from: its source sheets, plus the balance history for Account Balances"""
+        inputs = set(self.TAB_SOURCE_SHEETS[tab])
+        if tab == 'Account Balances':
+            inputs.add(self.HISTORY_SOURCE)
+        return inputs
+    
+    def open_previous_workbook(self, tabs):
+        """Reopen the last output and clear the tabs that need rebuilding"""
+        print("Reusing previous workbook...")
+        
+        wb = load_workbook(self.output_file)
+        for name in self.TAB_BUILDERS:
+            if name in tabs:
+                index = wb.sheetnames.index(name)
+                wb.remove(wb[name])
+                wb.create_sheet(title=name, index=index)
+                print(f"  ↻ Rebuilding tab: {name}")
+            else:
+                print(f"  ✓ Unchanged tab: {name}")
+        
+        return wb
+    
+    def write_headers(self, ws, headers, row=1):
+        """Write a header row in the tab's shared header style"""
+        styles = style_registry(ws)
+        for i, header in enumerate(headers, 1):
+            cell = ws.cell(row=row, column=i)
+            cell.value = header
+            styles.apply(cell, header_style_name(ws.title))
+    
     def calculate_key_metrics(self):
-        """Calculate key financial metrics from the original data"""
+        """Calculate key financial metrics from the original data (amounts as numbers, notes as text)"""
         metrics = {}
         
         try:
@@ -120,37 +318,31 @@ class FinancialDashboardStreamliner:
             total_debt = 0
             
             if 'Account Balances' in self.data:
-                account_data = self.data['Account Balances']
-                if 'Amount' in account_data.columns:
-                    total_assets = account_data['Amount'].sum()
-                    metrics['Total Assets'] = f"${total_assets:,.2f}"
+                total_assets = self.data['Account Balances']['Amount'].sum()
+                metrics['Total Assets'] = total_assets
             
             # Total debt calculation
             if 'Debt Summary' in self.data:
-                debt_data = self.data['Debt Summary']
-                if 'Balance' in debt_data.columns:
-                    total_debt = debt_data['Balance'].sum()
-                    metrics['Total Debt'] = f"${total_debt:,.2f}"
-                    
-                    # Net worth
-                    if total_assets > 0:
-                        net_worth = total_assets - total_debt
-                        metrics['Net Worth'] = f"${net_worth:,.2f}"
+                total_debt = self.data['Debt Summary']['Balance'].sum()
+                metrics['Total Debt'] = total_debt
+                
+                # Net worth
+                if total_assets > 0:
+                    net_worth = total_assets - total_debt
+                    metrics['Net Worth'] = net_worth
             
             # Monthly income (latest)
             if 'Income' in self.data:
                 income_data = self.data['Income']
-                if 'Net Pay' in income_data.columns and not income_data.empty:
+                if not income_data.empty:
                     latest_income = income_data['Net Pay'].iloc[-1]
                     if pd.notna(latest_income):
-                        metrics['Latest Monthly Net Pay'] = f"${latest_income:,.2f}"
+                        metrics['Latest Monthly Net Pay'] = latest_income
             
             # Basic expense calculation
-            if 'Personal Expenses Detail' in self.data and 'Shared Expenses Detail' in self.data:
-                personal_total = self.data['Personal Expenses Detail']['price'].sum() if 'price' in self.data['Personal Expenses Detail'].columns else 0
-                shared_total = self.data['Shared Expenses Detail']['price'].sum() * 0.5 if 'price' in self.data['Shared Expenses Detail'].columns else 0
-                total_expenses = personal_total + shared_total
-                metrics['Total Tracked Expenses'] = f"${total_expenses:,.2f}"
+            if all(self.has_source_sheet(sheet) for sheet in self.EXPENSE_SHEETS):
+                total_expenses = self.monthly_cube().total()
+                metrics['Total Tracked Expenses'] = total_expenses
                 
         except Exception as e:
             print(f"Error calculating metrics: {e}")
@@ -163,39 +355,40 @@ class FinancialDashboardStreamliner:
         print("Building Dashboard tab...")
         ws = wb['Dashboard']
         
-        # Header styling
-        header_font = Font(name='Arial', size=16, bold=True, color='FFFFFF')
-        header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+        # Shared named styles for the title, section banners and labels
+        styles = style_registry(ws)
         
         # Title
         ws['A1'] = 'Financial Dashboard - Executive Summary'
-        ws['A1'].font = Font(name='Arial', size=20, bold=True)
+        styles.apply(ws['A1'], 'Dashboard Title')
         ws.merge_cells('A1:F1')
         
         # Current date
         ws['A2'] = f'Generated: {datetime.now().strftime("%B %d, %Y")}'
-        ws['A2'].font = Font(name='Arial', size=12, italic=True)
+        styles.apply(ws['A2'], 'Dashboard Note')
         
         # Key Metrics Section
         ws['A4'] = 'KEY FINANCIAL METRICS'
-        ws['A4'].font = header_font
-        ws['A4'].fill = header_fill
+        styles.apply(ws['A4'], 'Dashboard Section')
         ws.merge_cells('A4:F4')
         
         # Calculate key metrics from original data
         metrics = self.calculate_key_metrics()
         
+        writer = TypedCellWriter(ws)
         row = 6
         for metric, value in metrics.items():
             ws[f'A{row}'] = metric
-            ws[f'B{row}'] = value
-            ws[f'A{row}'].font = Font(bold=True)
+            if isinstance(value, str):
+                ws[f'B{row}'] = value
+            else:
+                writer.write(row, 2, value, 'currency')
+            styles.apply(ws[f'A{row}'], 'Bold Label')
             row += 1
         
         # Account Summary Section
         ws[f'A{row+1}'] = 'ACCOUNT SUMMARY'
-        ws[f'A{row+1}'].font = header_font
-        ws[f'A{row+1}'].fill = header_fill
+        styles.apply(ws[f'A{row+1}'], 'Dashboard Section')
         ws.merge_cells(f'A{row+1}:F{row+1}')
         
         # Add account balances summary
@@ -214,24 +407,77 @@ class FinancialDashboardStreamliner:
         
         # Headers
         headers = ['Account Type', 'Balance', '3-Month Change']
+        styles = style_registry(ws)
         for i, header in enumerate(headers, 1):
             cell = ws.cell(row=start_row, column=i)
             cell.value = header
-            cell.font = Font(bold=True)
+            styles.apply(cell, 'Bold Label')
         
         # Data
+        writer = TypedCellWriter(ws)
         row = start_row + 1
         for _, account in account_data.iterrows():
             if pd.notna(account.get('Asset Category')) and pd.notna(account.get('Amount')):
                 ws.cell(row=row, column=1).value = account['Asset Category']
-                ws.cell(row=row, column=2).value = f"${account['Amount']:,.2f}"
-                
-                if pd.notna(account.get('3-Month Change')):
-                    change_pct = account['3-Month Change'] * 100
-                    ws.cell(row=row, column=3).value = f"{change_pct:.1f}%"
-                
+                writer.write(row, 2, account['Amount'], 'currency')
+                writer.write(row, 3, account.get('3-Month Change'), 'percent')
                 row += 1
     
+    def normalize_expense_frame(self, expenses, type_label, split):
+        """Normalise one expense detail sheet into Transaction Log columns"""
+        expenses = expenses[expenses['date'].notna()]
+        categories = expenses['category']
+        prices = expenses['price']
+        
+        # Standardize once per distinct category and broadcast back to the rows
+        standardized = self.category_resolver.resolve(categories)
+        
+        return pd.DataFrame({
+            'Date': expenses['date'],
+            'Company': expenses['company'] if 'company' in expenses.columns else '',
+            'Original Category': categories,
+            'Standardized Category': standardized,
+            'Type': type_label,
+            'Amount': prices,
+            'Split Amount': prices * split
+        }, index=expenses.index)
+    
+    def has_source_sheet(self, sheet):
+        """Whether a sheet is available, loaded in memory or left in the workbook for chunked reading"""
+        if self.chunk_rows and sheet in self.EXPENSE_SHEETS:
+            return sheet in self.source_sheet_names
+        return sheet in self.data
+    
+    def expense_frames(self):
+        """Yield (sheet, frame) for the expense detail sheets, as whole sheets or out-of-core row chunks"""
+        for sheet in self.EXPENSE_SHEETS:
+            if not self.chunk_rows:
+                if sheet in self.data:
+                    yield sheet, self.data[sheet]
+                continue
+            rows = 0
+            schema = SOURCE_SCHEMAS[sheet]
+            for chunk in iter_sheet_chunks(self.original_file, sheet, self.chunk_rows):
+                rows += chunk.shape[0]
+                try:
+                    chunk = schema.conform(chunk)
+                except ValueError as e:
+                    raise schema.value_drift(e)
+                yield sheet, chunk
+            self.chunked_rows[sheet] = rows
+    
+    def iter_transaction_frames(self):
+        """Transaction Log rows per expense frame, in sheet order"""
+        columns = ['Date', 'Company', 'Original Category', 'Standardized Category',
+                   'Type', 'Amount', 'Split Amount']
+        for sheet, expenses in self.expense_frames():
+            type_label, split = self.EXPENSE_SHEETS[sheet]
+            if split != 1:
+                type_label = f"{type_label} ({split:.0%})"
+            frame = self.normalize_expense_frame(expenses, type_label, split)
+            if not frame.empty:
+                yield frame[columns]
+    
     def create_transaction_log_tab(self, wb):
         """Create unified Transaction Log tab"""
         print("Building Transaction Log tab...")
@@ -241,56 +487,76 @@ class FinancialDashboardStreamliner:
         headers = ['Date', 'Company', 'Original Category', 'Standardized Category', 
                   'Type', 'Amount', 'Split Amount']
         
-        for i, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=i)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='D9E2F3', end_color='D9E2F3', fill_type='solid')
+        self.write_headers(ws, headers)
         
-        # Combine personal and shared expenses
-        row = 2
-        
-        # Add personal expenses
-        if 'Personal Expenses Detail' in self.data:
-            personal_exp = self.data['Personal Expenses Detail']
-            for _, transaction in personal_exp.iterrows():
-                if pd.notna(transaction.get('date')):
-                    ws.cell(row=row, column=1).value = transaction['date']
-                    ws.cell(row=row, column=2).value = transaction.get('company', '')
-                    ws.cell(row=row, column=3).value = transaction.get('category', '')
-                    
-                    # Standardized category
-                    orig_cat = str(transaction.get('category', '')).lower()
-                    std_cat = self.category_mapping.get(orig_cat, 'Other')
-                    ws.cell(row=row, column=4).value = std_cat
-                    
-                    ws.cell(row=row, column=5).value = 'Personal'
-                    ws.cell(row=row, column=6).value = transaction.get('price', 0)
-                    ws.cell(row=row, column=7).value = transaction.get('price', 0)
-                    row += 1
+        if isinstance(ws, RowBuffer):
+            # Buffered sheets write their widths before the first flush, so fit them from every row up front
+            ws.set_column_widths(measure_frame_widths(self.iter_transaction_frames(), headers))
         
-        # Add shared expenses (50% split)
-        if 'Shared Expenses Detail' in self.data:
-            shared_exp = self.data['Shared Expenses Detail']
-            for _, transaction in shared_exp.iterrows():
-                if pd.notna(transaction.get('date')):
-                    ws.cell(row=row, column=1).value = transaction['date']
-                    ws.cell(row=row, column=2).value = transaction.get('company', '')
-                    ws.cell(row=row, column=3).value = transaction.get('category', '')
-                    
-                    # Standardized category
-                    orig_cat = str(transaction.get('category', '')).lower()
-                    std_cat = self.category_mapping.get(orig_cat, 'Other')
-                    ws.cell(row=row, column=4).value = std_cat
-                    
-                    ws.cell(row=row, column=5).value = 'Shared (50%)'
-                    ws.cell(row=row, column=6).value = transaction.get('price', 0)
-                    ws.cell(row=row, column=7).value = transaction.get('price', 0) * 0.5
-                    row += 1
+        # Append personal then shared expenses as whole rows, a chunk at a time when out of core
+        for transactions in self.iter_transaction_frames():
+            for values in transactions.itertuples(index=False, name=None):
+                ws.append(values)
         
         # Auto-fit columns
         self.auto_fit_columns(ws)
     
+    def numeric_column(self, df, column, default=0):
+        """Optional schema column as numbers, or a constant when the sheet lacks it"""
+        if column in df.columns:
+            return pd.to_numeric(df[column], errors='coerce')
+        return pd.Series(default, index=df.index, dtype=float)
+    
+    def monthly_totals_from_transactions(self):
+        """Per-month net pay and expenses derived from the detail sheets"""
+        by_type = self.monthly_cube().by_month('Type')
+        frame = pd.DataFrame({
+            'Personal Expenses': by_type.get('Personal', 0),
+            'Shared Expenses (50%)': by_type.get('Shared', 0)
+        }, index=by_type.index)
+        
+        income = self.data.get('Income')
+        if income is not None and 'date' in income.columns:
+            net_pay = income['Net Pay'].groupby(income['date'].dt.to_period('M')).sum(min_count=1)
+            frame['Net Income'] = net_pay.reindex(frame.index)
+        else:
+            frame['Net Income'] = np.nan
+        return frame.rename_axis('Month').reset_index()
+    
+    def build_monthly_summary(self):
+        """One row per month with savings metrics, rolling averages and year-over-year deltas"""
+        income_exp = self.data.get('Income vs Expenses')
+        if income_exp is not None:
+            income_exp = income_exp[income_exp['Start Date'].notna()]
+            frame = pd.DataFrame({
+                'Month': income_exp['Start Date'].dt.to_period('M'),
+                'Net Income': income_exp['Net Pay'],
+                'Personal Expenses': income_exp['Personal Expenses'],
+                'Shared Expenses (50%)': income_exp['50% Shared Expenses']
+            })
+        else:
+            frame = self.monthly_totals_from_transactions()
+        
+        summary = frame.dropna(subset=['Month']).groupby('Month').sum(min_count=1)
+        if summary.empty:
+            return summary
+        
+        summary['Total Expenses'] = (summary['Personal Expenses'].fillna(0) +
+                                     summary['Shared Expenses (50%)'].fillna(0))
+        summary['Net Savings'] = summary['Net Income'] - summary['Total Expenses']
+        summary['Savings Rate'] = (summary['Net Savings'] / summary['Net Income']).where(
+            summary['Net Income'] > 0, 0).where(summary['Net Income'].notna())
+        
+        # Rolling windows and YoY lags run over the full calendar so gaps are not skipped over
+        observed = summary.index
+        summary = summary.reindex(pd.period_range(observed.min(), observed.max(), freq='M'))
+        for window in (3, 6, 12):
+            summary[f'Savings {window}-Mo Avg'] = summary['Net Savings'].rolling(window).mean()
+        summary['Expenses YoY Change'] = summary['Total Expenses'] - summary['Total Expenses'].shift(12)
+        summary['Savings YoY Change'] = summary['Net Savings'] - summary['Net Savings'].shift(12)
+        
+        return summary.loc[observed]
+    
     def create_monthly_summary_tab(self, wb):
         """Create Monthly Summary tab"""
         print("Building Monthly Summary tab...")
@@ -298,37 +564,57 @@ class FinancialDashboardStreamliner:
         
         # Headers
         headers = ['Month', 'Net Income', 'Personal Expenses', 'Shared Expenses (50%)', 
-                  'Total Expenses', 'Net Savings', 'Savings Rate']
+                  'Total Expenses', 'Net Savings', 'Savings Rate',
+                  'Savings 3-Mo Avg', 'Savings 6-Mo Avg', 'Savings 12-Mo Avg',
+                  'Expenses YoY Change', 'Savings YoY Change']
         
-        for i, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=i)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='E2EFDA', end_color='E2EFDA', fill_type='solid')
-        
-        # Add data from Income vs Expenses if available
-        if 'Income vs Expenses' in self.data:
-            income_exp_data = self.data['Income vs Expenses']
-            for i, (_, row) in enumerate(income_exp_data.iterrows(), 2):
-                if pd.notna(row.get('Start Date')):
-                    ws.cell(row=i, column=1).value = row['Start Date']
-                    ws.cell(row=i, column=2).value = row.get('Net Pay', 0)
-                    ws.cell(row=i, column=3).value = row.get('Personal Expenses', 0)
-                    ws.cell(row=i, column=4).value = row.get('50% Shared Expenses', 0)
-                    
-                    # Calculate totals
-                    total_exp = (row.get('Personal Expenses', 0) + 
-                               row.get('50% Shared Expenses', 0))
-                    net_savings = row.get('Net Pay', 0) - total_exp
-                    savings_rate = (net_savings / row.get('Net Pay', 1)) * 100 if row.get('Net Pay', 0) > 0 else 0
-                    
-                    ws.cell(row=i, column=5).value = total_exp
-                    ws.cell(row=i, column=6).value = net_savings
-                    ws.cell(row=i, column=7).value = f"{savings_rate:.1f}%"
+        self.write_headers(ws, headers)
+        
+        # Income vs Expenses when available, otherwise months derived from the transaction detail
+        summary = self.build_monthly_summary()
+        
+        writer = TypedCellWriter(ws)
+        for row, (month, values) in enumerate(summary.iterrows(), 2):
+            writer.write(row, 1, month, 'month')
+            for column, header in enumerate(headers[1:], 2):
+                writer.write(row, column, values[header], 'percent' if header == 'Savings Rate' else 'currency')
         
         # Auto-fit columns
         self.auto_fit_columns(ws)
     
+    def current_account_balances(self):
+        """(account name, account type, balance) rows as listed on the Account Balances tab"""
+        balances = []
+        if 'Katherine Assets' in self.data:
+            assets = self.data['Katherine Assets']
+            assets = assets[assets['Name'].notna()]
+            types = assets['Type'] if 'Type' in assets.columns else 'Unknown'
+            balances += zip(assets['Name'], pd.Series(types, index=assets.index), assets['Balance'])
+        if 'Account Balances' in self.data:
+            accounts = self.data['Account Balances']
+            accounts = accounts[accounts['Asset Category'].notna()]
+            balances += zip(accounts['Asset Category'].astype(str) + ' (Summary)', accounts['Asset Category'],
+                            accounts['Amount'])
+        return balances
+    
+    def record_balance_history(self):
+        """Append today's balances to the history store and query the changes against earlier runs"""
+        if not self.balance_history:
+            return None
+        
+        with self.instrumentation.span('record_balance_history') as span:
+            with BalanceHistory(self.history_path) as history:
+                span['rows'] = history.record(self.current_account_balances())
+                self.balance_changes = history.changes(self.change_window_days)
+        return self.balance_changes
+    
+    def account_balance_changes(self):
+        """Changes per account from the history store, read-only when no run has recorded yet"""
+        if self.balance_changes is None and self.balance_history:
+            with BalanceHistory(self.history_path) as history:
+                self.balance_changes = history.changes(self.change_window_days)
+        return self.balance_changes
+    
     def create_account_balances_tab(self, wb):
         """Create consolidated Account Balances tab"""
         print("Building Account Balances tab...")
@@ -338,42 +624,105 @@ class FinancialDashboardStreamliner:
         headers = ['Account Name', 'Account Type', 'Current Balance', 
                   'Previous Balance', 'Change Amount', 'Change %', 'Last Updated']
         
-        for i, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=i)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='FFF2CC', end_color='FFF2CC', fill_type='solid')
+        self.write_headers(ws, headers)
         
-        row = 2
+        # Previous balances and changes come from the history of earlier runs
+        changes = self.account_balance_changes()
+        if changes is None:
+            changes = pd.DataFrame(columns=['Previous Balance', 'Change Amount', 'Change %', 'Last Updated'])
         
-        # Add Katherine's assets
-        if 'Katherine Assets' in self.data:
-            katherine_assets = self.data['Katherine Assets']
-            for _, asset in katherine_assets.iterrows():
-                if pd.notna(asset.get('Name')):
-                    ws.cell(row=row, column=1).value = asset['Name']
-                    ws.cell(row=row, column=2).value = asset.get('Type', 'Unknown')
-                    ws.cell(row=row, column=3).value = asset.get('Balance', 0)
-                    row += 1
-        
-        # Add main account balance data
-        if 'Account Balances' in self.data:
-            account_data = self.data['Account Balances']
-            for _, account in account_data.iterrows():
-                if pd.notna(account.get('Asset Category')):
-                    ws.cell(row=row, column=1).value = f"{account['Asset Category']} (Summary)"
-                    ws.cell(row=row, column=2).value = account['Asset Category']
-                    ws.cell(row=row, column=3).value = account.get('Amount', 0)
-                    
-                    if pd.notna(account.get('3-Month Change')):
-                        change_pct = account['3-Month Change']
-                        ws.cell(row=row, column=6).value = f"{change_pct*100:.2f}%"
-                    
-                    row += 1
+        writer = TypedCellWriter(ws)
+        row = 2
+        for (name, account_type, balance), source_change in zip(self.current_account_balances(),
+                                                                self.source_three_month_changes()):
+            ws.cell(row=row, column=1).value = name
+            ws.cell(row=row, column=2).value = account_type
+            writer.write(row, 3, balance, 'currency')
+            
+            change = changes.loc[name] if name in changes.index else None
+            if change is not None and pd.notna(change['Previous Balance']):
+                writer.write(row, 4, change['Previous Balance'], 'currency')
+                writer.write(row, 5, change['Change Amount'], 'currency')
+                writer.write(row, 6, change['Change %'], 'percent_2')
+            else:
+                # No earlier run yet, so fall back on the change the source sheet carries
+                writer.write(row, 6, source_change, 'percent_2')
+            if change is not None:
+                writer.write(row, 7, change['Last Updated'], 'date')
+            row += 1
         
         # Auto-fit columns
         self.auto_fit_columns(ws)
     
+    def source_three_month_changes(self):
+        """3-Month Change from the source sheet, aligned with current_account_balances"""
+        changes = []
+        if 'Katherine Assets' in self.data:
+            changes += [np.nan] * int(self.data['Katherine Assets']['Name'].notna().sum())
+        if 'Account Balances' in self.data:
+            accounts = self.data['Account Balances']
+            accounts = accounts[accounts['Asset Category'].notna()]
+            changes += list(self.numeric_column(accounts, '3-Month Change', np.nan))
+        return changes
+    
+    def infer_interest_rate(self, debt_detail):
+        """Annual rate implied by the recent payment history of a debt detail sheet"""
+        if 'payment' not in debt_detail.columns or len(debt_detail) < 2:
+            return np.nan
+        history = debt_detail[['payment', 'current debt amount']].apply(pd.to_numeric, errors='coerce').tail(13)
+        previous = history['current debt amount'].shift(1)
+        interest = history['payment'] - (previous - history['current debt amount'])
+        rates = (interest / previous * 12).where(previous > 0).dropna()
+        return max(rates.median(), 0.0) if not rates.empty else np.nan
+    
+    def debt_portfolio(self):
+        """One row per debt with balance, payment, rate and as-of month for projections
+
+        Detail sheets are more current than Debt Summary, so their latest row wins
+        for a debt listed in both; the summary still supplies the interest rate.
+        """
+        debts = {}
+        if 'Debt Summary' in self.data:
+            summary = self.data['Debt Summary']
+            summary = summary[summary['Debt Type'].notna()]
+            for name, balance, payment, rate in zip(summary['Debt Type'], summary['Balance'],
+                                                    self.numeric_column(summary, 'Monthly Payment'),
+                                                    self.numeric_column(summary, 'Interest Rate', np.nan)):
+                debts[str(name).lower()] = {'Debt': str(name), 'Balance': balance, 'Payment': payment,
+                                            'Rate': rate, 'As Of': None, 'Detailed': False}
+        
+        for sheet_name in self.DEBT_SHEETS:
+            debt_detail = self.data.get(sheet_name)
+            if debt_detail is None or debt_detail.empty:
+                continue
+            latest = debt_detail.iloc[-1]
+            if pd.isna(latest['current debt amount']):
+                continue
+            debt = debts.setdefault(sheet_name.lower(), {'Debt': sheet_name, 'Payment': np.nan,
+                                                         'Rate': np.nan})
+            debt['Balance'] = latest['current debt amount']
+            if pd.notna(latest.get('payment')):
+                debt['Payment'] = latest['payment']
+            if pd.isna(debt['Rate']):
+                debt['Rate'] = self.infer_interest_rate(debt_detail)
+            debt['As Of'] = latest.get('date') if pd.notna(latest.get('date')) else None
+            debt['Detailed'] = True
+        
+        portfolio = pd.DataFrame(list(debts.values()),
+                                 columns=['Debt', 'Balance', 'Payment', 'Rate', 'As Of', 'Detailed'])
+        portfolio[['Balance', 'Payment', 'Rate']] = portfolio[['Balance', 'Payment', 'Rate']].apply(
+            pd.to_numeric, errors='coerce').fillna(0)
+        # Projections start the month after the latest payment, or next month without a history
+        as_of = pd.to_datetime(portfolio['As Of'], errors='coerce').dt.to_period('M')
+        portfolio['Start'] = as_of.fillna(pd.Period(date.today(), freq='M')) + 1
+        return portfolio
+    
+    def payoff_date(self, start, months):
+        """Month a debt is repaid, counting the start month as payment 1"""
+        if not np.isfinite(months):
+            return None
+        return (start + max(int(months) - 1, 0)).to_timestamp().to_pydatetime()
+    
     def create_debt_tracking_tab(self, wb):
         """Create unified Debt Tracking tab"""
         print("Building Debt Tracking tab...")
@@ -383,11 +732,26 @@ class FinancialDashboardStreamliner:
         headers = ['Debt Type', 'Current Balance', 'Monthly Payment', 'Interest Rate', 
                   'Payoff Date (Est.)', 'Total Interest', 'Last Updated']
         
-        for i, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=i)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='FCE4D6', end_color='FCE4D6', fill_type='solid')
+        self.write_headers(ws, headers)
+        
+        # Project every debt at its minimum payment in one batch
+        portfolio = self.debt_portfolio()
+        projection = project(portfolio['Balance'], portfolio['Rate'], portfolio['Payment'])
+        projected = {name.lower(): (detailed, start, months, interest)
+                     for name, detailed, start, months, interest in
+                     zip(portfolio['Debt'], portfolio['Detailed'], portfolio['Start'],
+                         projection.payoff_months[0], projection.interest[0])}
+        
+        writer = TypedCellWriter(ws)
+        
+        def write_projection(row, name):
+            _, start, months, interest = projected[name.lower()]
+            payoff = self.payoff_date(start, months)
+            if payoff is None:
+                ws.cell(row=row, column=5).value = 'Not repaid at current payment'
+                return
+            writer.write(row, 5, payoff, 'month')
+            writer.write(row, 6, round(float(interest), 2), 'currency')
         
         row = 2
         
@@ -397,38 +761,145 @@ class FinancialDashboardStreamliner:
             for _, debt in debt_summary.iterrows():
                 if pd.notna(debt.get('Debt Type')):
                     ws.cell(row=row, column=1).value = debt['Debt Type']
-                    ws.cell(row=row, column=2).value = debt.get('Balance', 0)
-                    ws.cell(row=row, column=3).value = debt.get('Monthly Payment', 0)
-                    if pd.notna(debt.get('Interest Rate')):
-                        ws.cell(row=row, column=4).value = f"{debt.get('Interest Rate', 0)*100:.2f}%"
+                    writer.write(row, 2, debt.get('Balance', 0), 'currency')
+                    writer.write(row, 3, debt.get('Monthly Payment', 0), 'currency')
+                    writer.write(row, 4, debt.get('Interest Rate'), 'percent_2')
+                    # Debts with a detail sheet are projected on their detailed row below
+                    if not projected[str(debt['Debt Type']).lower()][0]:
+                        write_projection(row, str(debt['Debt Type']))
                     row += 1
         
         # Add detailed debt tracking information
-        debt_sheets = ['Car', 'Credit Line', 'Home Energy', 'Mortgage']
-        for sheet_name in debt_sheets:
+        for sheet_name in self.DEBT_SHEETS:
             if sheet_name in self.data:
                 debt_detail = self.data[sheet_name]
-                if not debt_detail.empty and 'current debt amount' in debt_detail.columns:
+                if not debt_detail.empty:
                     latest_balance = debt_detail['current debt amount'].iloc[-1]
                     if pd.notna(latest_balance):
                         ws.cell(row=row, column=1).value = f"{sheet_name} (Detailed)"
-                        ws.cell(row=row, column=2).value = latest_balance
+                        writer.write(row, 2, latest_balance, 'currency')
                         
                         if 'payment' in debt_detail.columns:
-                            latest_payment = debt_detail['payment'].iloc[-1]
-                            if pd.notna(latest_payment):
-                                ws.cell(row=row, column=3).value = latest_payment
+                            writer.write(row, 3, debt_detail['payment'].iloc[-1], 'currency')
+                        
+                        rate = portfolio.loc[portfolio['Debt'].str.lower() == sheet_name.lower(), 'Rate'].iloc[0]
+                        writer.write(row, 4, rate, 'percent_2')
+                        write_projection(row, sheet_name)
                         
                         if 'date' in debt_detail.columns:
-                            latest_date = debt_detail['date'].iloc[-1]
-                            if pd.notna(latest_date):
-                                ws.cell(row=row, column=7).value = latest_date
+                            writer.write(row, 7, debt_detail['date'].iloc[-1], 'date')
                         
                         row += 1
         
+        if not portfolio.empty:
+            row = self.add_payoff_scenarios(ws, row + 1, portfolio, projection)
+            self.add_balance_projection(ws, row + 1, portfolio)
+        
         # Auto-fit columns
         self.auto_fit_columns(ws)
     
+    def add_payoff_scenarios(self, ws, start_row, portfolio, baseline):
+        """What-if table: extra monthly payments under avalanche and snowball ordering"""
+        ws.cell(row=start_row, column=1).value = 'What-If Payoff Scenarios'
+        style_registry(ws).apply(ws.cell(row=start_row, column=1), 'Subsection Title')
+        
+        headers = ['Strategy', 'Extra Monthly Payment', 'Debt-Free Date', 'Total Interest',
+                  'Interest Saved']
+        self.write_headers(ws, headers, row=start_row + 1)
+        
+        # All extra-payment amounts for a strategy are projected together as one 2-D batch
+        scenarios = [('Minimum payments', 0, baseline.payoff_months[0], baseline.total_interest[0])]
+        for strategy, label in (('avalanche', 'Avalanche (highest rate first)'),
+                                ('snowball', 'Snowball (smallest balance first)')):
+            result = project(portfolio['Balance'], portfolio['Rate'], portfolio['Payment'],
+                             extra=self.PAYOFF_EXTRA_PAYMENTS, strategy=strategy)
+            for extra, payoff_months, interest in zip(self.PAYOFF_EXTRA_PAYMENTS, result.payoff_months,
+                                                      result.total_interest):
+                scenarios.append((label, extra, payoff_months, interest))
+        
+        writer = TypedCellWriter(ws)
+        baseline_interest = baseline.total_interest[0]
+        row = start_row + 2
+        for label, extra, payoff_months, interest in scenarios:
+            ws.cell(row=row, column=1).value = label
+            writer.write(row, 2, extra, 'currency')
+            if np.isfinite(payoff_months).all():
+                # Debts can be current as of different months, so take the latest payoff date
+                writer.write(row, 3, max(self.payoff_date(start, months)
+                                         for start, months in zip(portfolio['Start'], payoff_months)), 'month')
+                writer.write(row, 4, round(float(interest), 2), 'currency')
+                if np.isfinite(baseline.payoff_months[0]).all():
+                    writer.write(row, 5, round(float(baseline_interest - interest), 2), 'currency')
+            else:
+                ws.cell(row=row, column=3).value = 'Not repaid at current payment'
+            row += 1
+        return row
+    
+    def add_balance_projection(self, ws, start_row, portfolio, years=5):
+        """Projected year-end balance of each debt at its current payment"""
+        ws.cell(row=start_row, column=1).value = 'Projected Year-End Balances'
+        style_registry(ws).apply(ws.cell(row=start_row, column=1), 'Subsection Title')
+        
+        first_year = portfolio['Start'].min().year
+        year_ends = [pd.Period(year=first_year + offset, month=12, freq='M') for offset in range(years)]
+        headers = ['Debt Type'] + [f"Dec {period.year}" for period in year_ends]
+        self.write_headers(ws, headers, row=start_row + 1)
+        
+        # Payments made by each year end, looked up in one (debts x months) schedule
+        starts = np.array([start.ordinal for start in portfolio['Start']])
+        payments_made = np.array([period.ordinal for period in year_ends])[None, :] - starts[:, None] + 1
+        horizon = max(int(payments_made.max()), 1)
+        schedule = balance_schedule(portfolio['Balance'], portfolio['Rate'], portfolio['Payment'], horizon)
+        schedule = np.hstack([portfolio['Balance'].to_numpy(dtype=float)[:, None], schedule])
+        balances = np.take_along_axis(schedule, np.clip(payments_made, 0, horizon), axis=1)
+        
+        writer = TypedCellWriter(ws)
+        for offset, (name, projected) in enumerate(zip(portfolio['Debt'], balances)):
+            row = start_row + 2 + offset
+            ws.cell(row=row, column=1).value = name
+            for column, balance in enumerate(projected, 2):
+                writer.write(row, column, round(float(balance), 2), 'currency')
+    
+    def budget_signature(self):
+        """Path and modification time of the budget file, so edits trigger a rebuild"""
+        if not self.budget_file:
+            return None
+        return {'path': os.path.abspath(self.budget_file),
+                'mtime_ns': os.stat(self.budget_file).st_mtime_ns}
+    
+    def load_budgets(self):
+        """Monthly budget per category from the budget file, else from the previous output"""
+        if self.budget_file:
+            if self.budget_file.lower().endswith('.csv'):
+                budgets = pd.read_csv(self.budget_file)
+            else:
+                budgets = pd.read_excel(self.budget_file)
+            amount_column = next((column for column in ('Budgeted Amount', 'Monthly Budget', 'Budget')
+                                  if column in budgets.columns), None)
+            if 'Category' not in budgets.columns or amount_column is None:
+                raise ValueError(f"Budget file {self.budget_file} needs a Category column and a "
+                                 f"Budgeted Amount, Monthly Budget or Budget column")
+            amounts = pd.to_numeric(budgets[amount_column], errors='coerce')
+            return dict(zip(budgets['Category'][amounts.notna()], amounts[amounts.notna()]))
+        
+        # Keep whatever was typed into the Budgeted Amount column of the last output
+        if not os.path.exists(self.output_file):
+            return {}
+        try:
+            previous_wb = load_workbook(self.output_file, read_only=True)
+        except Exception:
+            return {}
+        budgets = {}
+        try:
+            if 'Budget Planning' in previous_wb.sheetnames:
+                rows = previous_wb['Budget Planning'].iter_rows(min_row=2, max_col=2, values_only=True)
+                for category, amount in rows:
+                    if category and category != 'TOTAL' and isinstance(amount, (int, float)):
+                        budgets[category] = amount
+        finally:
+            previous_wb.close()
+        return budgets
+    
     def create_budget_planning_tab(self, wb):
         """Create Budget Planning tab"""
         print("Building Budget Planning tab...")
@@ -438,92 +909,179 @@ class FinancialDashboardStreamliner:
         headers = ['Category', 'Budgeted Amount', 'Actual Spent (Current Month)', 
                   'Variance', 'Variance %', 'YTD Budgeted', 'YTD Actual', 'YTD Variance']
         
-        for i, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=i)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='DDEBF7', end_color='DDEBF7', fill_type='solid')
+        self.write_headers(ws, headers)
+        
+        # Current-month and year-to-date actuals for the latest month with transactions
+        cube = self.monthly_cube()
+        months = cube.months()
+        current_month = months[-1] if len(months) else pd.Period(date.today(), freq='M')
+        actuals = cube.year_to_date(current_month)
+        budgets = self.load_budgets()
         
-        # Create budget template with standardized categories
+        # Standardized categories first, then anything else with a budget or spending
         standardized_categories = list(set(self.category_mapping.values()))
         standardized_categories.sort()
+        extra = sorted((set(actuals.index) | set(budgets)) - set(standardized_categories))
         
+        writer = TypedCellWriter(ws)
         row = 2
-        for category in standardized_categories:
+        for category in standardized_categories + extra:
             ws.cell(row=row, column=1).value = category
-            ws.cell(row=row, column=2).value = 0  # Placeholder for budgeted amount
-            ws.cell(row=row, column=3).value = 0  # Will be calculated
+            writer.write(row, 2, budgets.get(category, 0), 'currency')
+            writer.write(row, 3, actuals['Current Month'].get(category, 0), 'currency')
             
             # Add formulas for variance calculations
-            ws.cell(row=row, column=4).value = f"=B{row}-C{row}"  # Variance
-            ws.cell(row=row, column=5).value = f"=IF(B{row}=0,0,(C{row}-B{row})/B{row}*100)"  # Variance %
+            writer.write(row, 4, f"=B{row}-C{row}", 'currency')  # Variance
+            writer.write(row, 5, f"=IF(B{row}=0,0,(C{row}-B{row})/B{row})", 'percent')  # Variance %
+            writer.write(row, 6, f"=B{row}*{current_month.month}", 'currency')  # YTD Budgeted
+            writer.write(row, 7, actuals['YTD'].get(category, 0), 'currency')
+            writer.write(row, 8, f"=F{row}-G{row}", 'currency')  # YTD Variance
             
             row += 1
         
         # Add totals row
         total_row = row + 1
         ws.cell(row=total_row, column=1).value = "TOTAL"
-        ws.cell(row=total_row, column=1).font = Font(bold=True)
-        ws.cell(row=total_row, column=2).value = f"=SUM(B2:B{row-1})"
-        ws.cell(row=total_row, column=3).value = f"=SUM(C2:C{row-1})"
-        ws.cell(row=total_row, column=4).value = f"=SUM(D2:D{row-1})"
+        style_registry(ws).apply(ws.cell(row=total_row, column=1), 'Bold Label')
+        for column in (2, 3, 4, 6, 7, 8):
+            letter = get_column_letter(column)
+            writer.write(total_row, column, f"=SUM({letter}2:{letter}{row-1})", 'currency')
+        writer.write(total_row, 5, f"=IF(B{total_row}=0,0,(C{total_row}-B{total_row})/B{total_row})",
+                     'percent')
+        
+        year_start = pd.Period(year=current_month.year, month=1, freq='M')
+        ws.cell(row=total_row + 1, column=1).value = (
+            f"Current month: {current_month.strftime('%b %Y')}; "
+            f"YTD: {year_start.strftime('%b')} to {current_month.strftime('%b %Y')}")
         
         # Auto-fit columns
         self.auto_fit_columns(ws)
     
+    def build_expense_frame(self, expense_frames=None):
+        """Combine expense frames (both detail sheets by default) into category, type, month and split amount columns"""
+        frames = []
+        for sheet, expenses in (self.expense_frames() if expense_frames is None else expense_frames):
+            type_label, split = self.EXPENSE_SHEETS[sheet]
+            expenses = expenses[expenses['price'].notna()]
+            # Uncategorised rows count towards totals but not towards any category
+            categories = self.category_resolver.resolve(expenses['category']).where(
+                expenses['category'].notna())
+            frames.append(pd.DataFrame({
+                'Category': categories,
+                'Type': type_label,
+                'Month': expenses['date'].dt.to_period('M'),
+                'Amount': expenses['price'] * split
+            }))
+        
+        if not frames:
+            return pd.DataFrame({'Category': pd.Series(dtype=object), 'Type': pd.Series(dtype=object),
+                                 'Month': pd.Series(dtype='period[M]'), 'Amount': pd.Series(dtype=float)})
+        return pd.concat(frames, ignore_index=True)
+    
+    def monthly_cube(self):
+        """Scan the expense detail sheets once into the month x category x type cube"""
+        if self.cube is not None:
+            return self.cube
+        
+        with self.instrumentation.span('build_monthly_cube') as span:
+            if self.chunk_rows:
+                frames = {sheet: source_signature(self.original_file)
+                          for sheet in self.EXPENSE_SHEETS if self.has_source_sheet(sheet)}
+            else:
+                frames = {sheet: self.data[sheet] for sheet in self.EXPENSE_SHEETS if sheet in self.data}
+            key = cube_key(frames, self.category_settings())
+            cube = MonthlyCube.load(self.original_file, key) if self.use_cache else None
+            span['cached'] = cube is not None
+            if cube is None:
+                if self.chunk_rows:
+                    cube = self.chunked_cube()
+                else:
+                    cube = MonthlyCube.from_expenses(self.build_expense_frame(),
+                                                     self.category_resolver.unmapped)
+                if self.use_cache:
+                    cube.save(self.original_file, key)
+            else:
+                self.category_resolver.unmapped.update(cube.unmapped)
+            if self.chunk_rows:
+                span['rows'] = sum(self.chunked_rows.values())
+            else:
+                span['rows'] = sum(df.shape[0] for df in frames.values())
+            span['cells'] = len(cube.cells)
+        
+        self.cube = cube
+        return cube
+    
+    def chunked_cube(self):
+        """Fold each out-of-core chunk into the cube, so only one chunk of rows is held at a time"""
+        cube = None
+        for chunk in self.expense_frames():
+            partial = MonthlyCube.from_expenses(self.build_expense_frame([chunk]))
+            cube = partial if cube is None else MonthlyCube.combine([cube, partial])
+        if cube is None:
+            cube = MonthlyCube.from_expenses(self.build_expense_frame([]))
+        return MonthlyCube(cube.cells, self.category_resolver.unmapped)
+    
+    def build_category_analysis(self):
+        """Totals, share, true monthly average and 3-month trend per standardized category"""
+        cube = self.monthly_cube()
+        totals = cube.by_category()
+        totals = totals.sort_values(ascending=False, kind='stable')
+        analysis = pd.DataFrame({'Total Spent': totals})
+        grand_total = totals.sum()
+        analysis['Share'] = totals / grand_total if grand_total > 0 else 0.0
+        analysis['Avg Monthly'] = np.nan
+        analysis['Trend'] = np.nan
+        
+        # Month x category grid over the observed date span, with empty months as zero
+        months = cube.months()
+        if len(months):
+            monthly = cube.by_month('Category')
+            analysis['Avg Monthly'] = monthly.sum() / len(months)
+            
+            # Change of the latest 3-month rolling average against the 3 months before it
+            if len(months) >= 6:
+                rolling = monthly.rolling(3).mean()
+                latest, previous = rolling.iloc[-1], rolling.iloc[-4]
+                analysis['Trend'] = ((latest - previous) / previous).where(previous > 0)
+        
+        return analysis, months
+    
     def create_category_analysis_tab(self, wb):
         """Create Category Analysis tab"""
         print("Building Category Analysis tab...")
         ws = wb['Category Analysis']
         
-        # Analyze spending by standardized categories
-        category_spending = {}
-        
-        # Analyze personal expenses
-        if 'Personal Expenses Detail' in self.data:
-            personal_exp = self.data['Personal Expenses Detail']
-            for _, expense in personal_exp.iterrows():
-                if pd.notna(expense.get('category')) and pd.notna(expense.get('price')):
-                    std_category = self.category_mapping.get(str(expense['category']).lower(), 'Other')
-                    category_spending[std_category] = category_spending.get(std_category, 0) + expense['price']
-        
-        # Analyze shared expenses (50%)
-        if 'Shared Expenses Detail' in self.data:
-            shared_exp = self.data['Shared Expenses Detail']
-            for _, expense in shared_exp.iterrows():
-                if pd.notna(expense.get('category')) and pd.notna(expense.get('price')):
-                    std_category = self.category_mapping.get(str(expense['category']).lower(), 'Other')
-                    category_spending[std_category] = category_spending.get(std_category, 0) + (expense['price'] * 0.5)
+        # Analyze spending by standardized categories (personal in full, shared at 50%)
+        analysis, months = self.build_category_analysis()
         
         # Headers
         headers = ['Category', 'Total Spent', '% of Total Spending', 'Avg Monthly', 
                   'Trend (Last 3 Months)', 'Notes']
         
-        for i, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=i)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='E2E2E2', end_color='E2E2E2', fill_type='solid')
+        self.write_headers(ws, headers)
         
         # Calculate totals
-        total_spending = sum(category_spending.values())
+        total_spending = analysis['Total Spent'].sum()
         
         # Add category data
+        writer = TypedCellWriter(ws)
         row = 2
-        sorted_categories = sorted(category_spending.items(), key=lambda x: x[1], reverse=True)
-        
-        for category, amount in sorted_categories:
+        for category, values in analysis.iterrows():
             ws.cell(row=row, column=1).value = category
-            ws.cell(row=row, column=2).value = amount
-            ws.cell(row=row, column=3).value = f"{(amount/total_spending*100):.1f}%" if total_spending > 0 else "0%"
-            ws.cell(row=row, column=4).value = amount / 12  # Rough monthly average
+            writer.write(row, 2, values['Total Spent'], 'currency')
+            writer.write(row, 3, values['Share'], 'percent')
+            writer.write(row, 4, values['Avg Monthly'], 'currency')
+            writer.write(row, 5, values['Trend'], 'percent')
             row += 1
         
         # Add total row
         ws.cell(row=row, column=1).value = "TOTAL"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = total_spending
-        ws.cell(row=row, column=3).value = "100.0%"
+        style_registry(ws).apply(ws.cell(row=row, column=1), 'Bold Label')
+        writer.write(row, 2, total_spending, 'currency')
+        writer.write(row, 3, 1.0 if total_spending > 0 else 0.0, 'percent')
+        if len(months):
+            writer.write(row, 4, analysis['Avg Monthly'].sum(), 'currency')
+            ws.cell(row=row, column=6).value = f"Averages over {len(months)} months ({months[0]} to {months[-1]})"
         
         # Auto-fit columns
         self.auto_fit_columns(ws)
@@ -533,28 +1091,63 @@ class FinancialDashboardStreamliner:
         print("Creating Streamlined Financial Dashboard...")
         print("=" * 60)
         
-        # Load original data
-        self.load_original_data()
-        
-        # Create new workbook structure
-        wb = self.create_workbook_structure()
-        
-        # Create each tab
-        self.create_dashboard_tab(wb)
-        self.create_transaction_log_tab(wb)
-        self.create_monthly_summary_tab(wb)
-        self.create_account_balances_tab(wb)
-        self.create_debt_tracking_tab(wb)
-        self.create_budget_planning_tab(wb)
-        self.create_category_analysis_tab(wb)
-        
-        # Save the workbook
-        wb.save(self.output_file)
-        print(f"\n✓ Streamlined dashboard saved to: {self.output_file}")
+        with self.instrumentation.span('create_streamlined_dashboard', output=self.output_file):
+            # Work out which tabs need building
+            manifest = None
+            tabs = self.selected_tabs()
+            
+            # Load original data (only the sheets the selected tabs read)
+            self.load_original_data(None if len(tabs) == len(self.TAB_BUILDERS) else self.required_sheets(tabs))
+            
+            # Capture today's account balances before deciding what to rebuild
+            self.record_balance_history()
+            
+            if self.incremental and len(tabs) == len(self.TAB_BUILDERS):
+                manifest, tabs = self.plan_incremental_build()
+                if not tabs:
+                    print(f"\n✓ Streamlined dashboard is up to date: {self.output_file}")
+                    return
+            
+            # Aggregate the expense detail once for every tab that reports on it
+            if any(self.EXPENSE_SHEETS.keys() & set(self.TAB_SOURCE_SHEETS[name]) for name in tabs):
+                self.monthly_cube()
+            
+            # Create new workbook structure, or reuse unchanged tabs from the last run
+            if len(tabs) == len(self.TAB_BUILDERS):
+                wb = self.create_workbook_structure()
+            else:
+                wb = self.open_previous_workbook(tabs)
+            
+            # Create each tab
+            for name in tabs:
+                self.build_tab(wb, name)
+            
+            # Save the workbook
+            with self.instrumentation.span('save') as span:
+                wb.save(self.output_file)
+                span['cells'] = sum(count_cells(wb[name]) for name in self.TAB_BUILDERS)
+            print(f"\n✓ Streamlined dashboard saved to: {self.output_file}")
+            
+            if manifest is not None:
+                manifest.save()
+            self.category_resolver.save()
         
         # Print summary
         self.print_summary()
     
+    def source_row_count(self, tab):
+        """Number of source rows a tab reads"""
+        return sum(self.data[sheet].shape[0] if sheet in self.data else self.chunked_rows.get(sheet, 0)
+                   for sheet in self.TAB_SOURCE_SHEETS[tab])
+    
+    def build_tab(self, wb, name):
+        """Run one tab builder inside an instrumentation span"""
+        builder = self.TAB_BUILDERS[name]
+        with self.instrumentation.span(builder, tab=name) as span:
+            getattr(self, builder)(wb)
+            span['rows'] = self.source_row_count(name)
+            span['cells'] = count_cells(wb[name])
+    
     def print_summary(self):
         """Print summary of the streamlining process"""
         print("\nSTREAMLINING SUMMARY:")
@@ -574,13 +1167,47 @@ class FinancialDashboardStreamliner:
         categories = sorted(set(self.category_mapping.values()))
         for i, category in enumerate(categories, 1):
             print(f"  {i:2d}. {category}")
+        
+        unmapped = sorted(self.category_resolver.unmapped)
+        if unmapped:
+            print(f"\nUnmapped categories filed under 'Other' ({len(unmapped)}):")
+            print(f"  {', '.join(unmapped)}")
 
 def main():
-    original_file = "/Users/marcusberley/Desktop/Financial Dashboard.xlsx"
-    output_file = "/Users/marcusberley/Desktop/Financial Dashboard - Streamlined.xlsx"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sources', nargs='*',
+                        help='source workbooks, directories or glob patterns to streamline as a batch')
+    parser.add_argument('--output-dir', help='where batch outputs are written (default: next to each source)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='workbooks streamlined at once in batch mode')
+    parser.add_argument('--report', help='batch summary JSON (default: batch_report.json in the output directory)')
+    args = parser.parse_args()
+    
+    if not args.sources:
+        original_file = "/Users/marcusberley/Desktop/Financial Dashboard.xlsx"
+        output_file = "/Users/marcusberley/Desktop/Financial Dashboard - Streamlined.xlsx"
+        
+        streamliner = FinancialDashboardStreamliner(original_file, output_file)
+        try:
+            streamliner.create_streamlined_dashboard()
+        except SchemaDriftError as e:
+            print(f"✗ {e}")
+            sys.exit(2)
+        return
+    
+    sources = find_workbooks(args.sources)
+    if not sources:
+        print(f"✗ No source workbooks matched: {' '.join(args.sources)}")
+        sys.exit(1)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    report_path = args.report or os.path.join(args.output_dir or os.getcwd(), 'batch_report.json')
     
-    streamliner = FinancialDashboardStreamliner(original_file, output_file)
-    streamliner.create_streamlined_dashboard()
+    # Each household keeps its own balance history next to its output
+    tasks = [(source, output, {}) for source, output in plan_outputs(sources, args.output_dir)]
+    report = run_batch(FinancialDashboardStreamliner, tasks, args.jobs, report_path)
+    if report['failed']:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
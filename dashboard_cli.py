@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Command-line tool for the Financial Dashboard scripts
+One entry point with analyze, streamline, verify and bench subcommands, all
+reading workbooks through the shared cached WorkbookLoader. Only the standard
+library is imported at startup; pandas and openpyxl load inside the command
+that needs them, so --help stays instant
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+# Mirror workbook_loader.READER_ENGINES and FinancialDashboardStreamliner.WRITERS, which cannot be imported without pandas
+READER_ENGINES = ('auto', 'calamine', 'openpyxl')
+WRITERS = ('openpyxl', 'xlsxwriter')
+
+TAB_NAMES = ['Dashboard', 'Transaction Log', 'Monthly Summary', 'Account Balances',
+             'Debt Tracking', 'Budget Planning', 'Category Analysis']
+
+
+def emit_json(payload):
+    json.dump(payload, sys.stdout, indent=2, default=str)
+    sys.stdout.write('\n')
+
+
+@contextlib.contextmanager
+def progress_output(args):
+    """Keep progress messages off stdout when it carries the JSON result"""
+    if args.format == 'json':
+        with contextlib.redirect_stdout(sys.stderr):
+            yield
+    else:
+        yield
+
+
+def map_files(func, files, jobs, *func_args):
+    """func(file, *func_args) for every file, in order, over up to jobs processes"""
+    if jobs <= 1 or len(files) <= 1:
+        return [func(file_path, *func_args) for file_path in files]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        futures = [executor.submit(func, file_path, *func_args) for file_path in files]
+        return [future.result() for future in futures]
+
+
+def safe_report(describe, file_path, *describe_args):
+    """describe() for one workbook, with a failure reported instead of raised"""
+    try:
+        return describe(file_path, *describe_args)
+    except Exception as e:
+        return {'file': file_path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def analyze_report(file_path, sheets, use_cache, engine, check_schema=False):
+    from analyze_excel import analyze_workbook
+    return safe_report(analyze_workbook, file_path, sheets, use_cache, engine, check_schema)
+
+
+def verify_report(file_path, sheets, use_cache, engine):
+    from verify_streamlined import verify_workbook
+    return safe_report(verify_workbook, file_path, sheets, use_cache, engine)
+
+
+def print_reports(reports, title, printer):
+    for report in reports:
+        print(f"{title}: {report['file']}")
+        print("=" * 60)
+        if 'error' in report:
+            print(f"Error analyzing file: {report['error']}")
+        else:
+            printer(report)
+
+
+def command_analyze(args):
+    reports = map_files(analyze_report, args.files, args.jobs, args.sheets, not args.no_cache, args.engine,
+                        args.check_schema)
+    if args.format == 'json':
+        emit_json(reports)
+    else:
+        from analyze_excel import print_analysis
+        print_reports(reports, "Analyzing Excel file", print_analysis)
+    if any('error' in report for report in reports):
+        return 1
+    return 2 if any(report.get('schema_drift') for report in reports) else 0
+
+
+def command_verify(args):
+    reports = map_files(verify_report, args.files, args.jobs, args.sheets, not args.no_cache, args.engine)
+    if args.format == 'json':
+        emit_json(reports)
+    else:
+        from verify_streamlined import print_verification
+        print_reports(reports, "Verifying Streamlined Dashboard", print_verification)
+    return 0 if all(report.get('ok') for report in reports) else 1
+
+
+def streamliner_options(args):
+    return {'streaming': args.streaming, 'incremental': args.incremental,
+            'use_cache': not args.no_cache, 'category_fallback': args.category_fallback,
+            'budget_file': args.budget_file, 'balance_history': not args.no_history,
+            'change_window_days': args.change_window, 'tabs': args.sheets, 'chunk_rows': args.chunk_rows,
+            'reader_engine': args.engine, 'writer': args.writer}
+
+
+def command_streamline(args):
+    from batch_runner import find_workbooks, plan_outputs
+    from create_streamlined_dashboard_fixed import FinancialDashboardStreamliner
+
+    single = len(args.sources) == 1 and os.path.isfile(args.sources[0])
+    sources = [os.path.abspath(args.sources[0])] if single else find_workbooks(args.sources)
+    if not sources:
+        print(f"✗ No source workbooks matched: {' '.join(args.sources)}", file=sys.stderr)
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    options = streamliner_options(args)
+
+    if single:
+        from instrumentation import Instrumentation, JsonLinesHook
+        output = args.output or plan_outputs(sources, args.output_dir)[0][1]
+        hooks = [JsonLinesHook(args.trace)] if args.trace else []
+        instrumentation = Instrumentation(hooks, trace_memory=args.trace_memory)
+        from sheet_schemas import SchemaDriftError
+        try:
+            with progress_output(args):
+                streamliner = FinancialDashboardStreamliner(sources[0], output,
+                                                            instrumentation=instrumentation, **options)
+                streamliner.create_streamlined_dashboard()
+        except SchemaDriftError as e:
+            print(f"✗ {e}", file=sys.stderr)
+            if args.format == 'json':
+                emit_json({'source': sources[0], 'output': output, 'schema_drift': e.report})
+            return 2
+        finally:
+            for hook in hooks:
+                hook.close()
+        if args.format == 'json':
+            emit_json({'source': sources[0], 'output': output,
+                       'source_rows': {sheet: int(df.shape[0]) for sheet, df in streamliner.data.items()},
+                       'open_seconds': round(streamliner.load_open_seconds, 4),
+                       'sheet_load_seconds': {sheet: round(seconds, 4)
+                                              for sheet, seconds in streamliner.load_timings.items()},
+                       'sheet_engines': streamliner.load_engines,
+                       'sheet_memory': streamliner.load_memory,
+                       'spans': instrumentation.records})
+        return 0
+
+    # Several workbooks: one per worker process, each with its own balance history
+    from batch_runner import run_batch
+    tasks = [(source, output, options) for source, output in plan_outputs(sources, args.output_dir)]
+    with progress_output(args):
+        report = run_batch(FinancialDashboardStreamliner, tasks, args.jobs, args.report)
+    if args.format == 'json':
+        emit_json(report)
+    return 1 if report['failed'] else 0
+
+
+def command_bench(args):
+    from benchmark_streamliner import run_benchmarks
+    with progress_output(args):
+        report = run_benchmarks(args.sizes, args.workdir, args.streaming, args.cache, args.engines,
+                                args.writer)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n✓ Benchmark results saved to: {args.output}")
+    if args.format == 'json':
+        emit_json(report)
+    return 0
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--format', choices=['text', 'json'], default='text',
+                        help='output format; json prints a single JSON document on stdout')
+    common.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help='run under cProfile; print the top functions, or save stats to FILE')
+    readers = argparse.ArgumentParser(add_help=False)
+    readers.add_argument('--engine', choices=READER_ENGINES, default='auto',
+                         help='sheet reader; auto uses calamine when installed, else openpyxl')
+    parallel = argparse.ArgumentParser(add_help=False)
+    parallel.add_argument('--jobs', type=int, default=1, help='files processed at once in worker processes')
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    analyze = commands.add_parser('analyze', parents=[common, readers, parallel], help='describe the sheets of source workbooks')
+    analyze.add_argument('files', nargs='+', help='workbooks to analyze (several run in parallel with --jobs)')
+    analyze.add_argument('--sheets', nargs='+', metavar='SHEET', help='only these sheets')
+    analyze.add_argument('--no-cache', action='store_true', help='parse every sheet instead of using the cache')
+    analyze.add_argument('--check-schema', action='store_true',
+                         help='check the headers against the source sheet schemas (exit status 2 on drift)')
+    analyze.set_defaults(handler=command_analyze)
+
+    verify = commands.add_parser('verify', parents=[common, readers, parallel], help='check streamlined workbooks have every tab')
+    verify.add_argument('files', nargs='+', help='streamlined workbooks (several run in parallel with --jobs)')
+    verify.add_argument('--sheets', nargs='+', metavar='SHEET', help='only summarise these tabs')
+    verify.add_argument('--no-cache', action='store_true', help='parse every sheet instead of using the cache')
+    verify.set_defaults(handler=command_verify)
+
+    streamline = commands.add_parser('streamline', parents=[common, readers, parallel],
+                                     help='build streamlined dashboards from source workbooks')
+    streamline.add_argument('sources', nargs='+',
+                            help='a source workbook, or several workbooks, directories or globs as a batch')
+    streamline.add_argument('--output', help='output workbook for a single source')
+    streamline.add_argument('--output-dir', help='where outputs are written (default: next to each source)')
+    streamline.add_argument('--sheets', nargs='+', metavar='TAB', choices=TAB_NAMES,
+                            help='rebuild only these tabs of the existing output')
+    streamline.add_argument('--streaming', action='store_true', help='use the streaming writer')
+    streamline.add_argument('--writer', choices=WRITERS, default='openpyxl',
+                            help='output backend; xlsxwriter writes in constant memory when installed')
+    streamline.add_argument('--chunk-rows', type=int, metavar='ROWS',
+                            help='stream the expense detail sheets out of core, ROWS at a time (implies --streaming)')
+    streamline.add_argument('--incremental', action='store_true', help='rebuild only tabs whose sources changed')
+    streamline.add_argument('--no-cache', action='store_true', help='parse every sheet instead of using the cache')
+    streamline.add_argument('--no-history', action='store_true', help='do not record account balance history')
+    streamline.add_argument('--change-window', type=int, metavar='DAYS',
+                            help='compare balances with DAYS ago instead of the previous run')
+    streamline.add_argument('--category-fallback', choices=['prefix', 'fuzzy'],
+                            help='match unmapped categories by prefix or fuzzy matching')
+    streamline.add_argument('--budget-file', help='CSV or Excel file of budget amounts per category')
+    streamline.add_argument('--trace', metavar='FILE', help='append instrumentation spans to FILE as JSON lines')
+    streamline.add_argument('--trace-memory', action='store_true', help='record tracemalloc peaks per span')
+    streamline.add_argument('--report', help='batch summary JSON file')
+    streamline.set_defaults(handler=command_streamline)
+
+    bench = commands.add_parser('bench', parents=[common], help='benchmark the streamliner on synthetic data')
+    bench.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                       help='transaction counts to benchmark')
+    bench.add_argument('--workdir', default=os.path.join(os.path.expanduser('~'), '.cache',
+                                                         'financial_dashboard', 'bench'),
+                       help='where synthetic workbooks and outputs are kept')
+    bench.add_argument('--output', default='bench_results.json', help='JSON results file')
+    bench.add_argument('--streaming', action='store_true', help='use the streaming writer')
+    bench.add_argument('--cache', action='store_true', help='read source sheets through the Parquet cache')
+    bench.add_argument('--writer', choices=WRITERS, default='openpyxl', help='output backend')
+    bench.add_argument('--engines', nargs='+', choices=READER_ENGINES, default=['auto'],
+                       help='reader engines to compare; the first is the baseline for per-sheet speedups')
+    bench.set_defaults(handler=command_bench)
+    return parser
+
+
+def run_profiled(handler, args):
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(handler, args)
+    finally:
+        if args.profile == '-':
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
+        else:
+            profiler.dump_stats(args.profile)
+            print(f"✓ Profile saved to: {args.profile}", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        return run_profiled(args.handler, args)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
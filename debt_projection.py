@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Vectorized debt amortisation for the Debt Tracking tab
+Balances, rates and payments are arrays with one entry per debt; payoff
+months and interest come from the closed-form annuity formulas, so a
+projection advances from one payoff to the next instead of month by month,
+and what-if scenarios are evaluated side by side as rows of a 2-D array
+"""
+import numpy as np
+
+MAX_MONTHS = 600
+STRATEGIES = ('minimum', 'avalanche', 'snowball')
+
+
+def months_to_payoff(balance, monthly_rate, payment):
+    """Whole months until each balance is repaid; inf where the payment does not cover interest"""
+    balance, monthly_rate, payment = np.broadcast_arrays(
+        np.asarray(balance, dtype=float), np.asarray(monthly_rate, dtype=float),
+        np.asarray(payment, dtype=float))
+    never = (payment <= 0) | (payment <= balance * monthly_rate)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        months = np.where(monthly_rate > 0,
+                          -np.log1p(-monthly_rate * balance / payment) / np.log1p(monthly_rate),
+                          balance / payment)
+    months = np.where(never, np.inf, np.ceil(months - 1e-9))
+    return np.where(balance <= 0, 0.0, months)
+
+
+def balance_after(balance, monthly_rate, payment, months):
+    """Balance left after paying a fixed amount for a number of months (never below zero)"""
+    growth = (1 + monthly_rate) ** months
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(monthly_rate > 0, (growth - 1) / monthly_rate, months)
+    return np.maximum(balance * growth - payment * annuity, 0.0)
+
+
+def balance_schedule(balances, annual_rates, payments, months):
+    """Month-end balance of every debt for the next months, as a (debts, months) array"""
+    balances = np.asarray(balances, dtype=float)[:, None]
+    monthly_rates = np.asarray(annual_rates, dtype=float)[:, None] / 12
+    payments = np.asarray(payments, dtype=float)[:, None]
+    return balance_after(balances, monthly_rates, payments, np.arange(1, months + 1)[None, :])
+
+
+class DebtProjection:
+    """Payoff month (inf when never repaid) and total interest per scenario and debt"""
+    def __init__(self, payoff_months, interest):
+        self.payoff_months = payoff_months
+        self.interest = interest
+
+    @property
+    def total_interest(self):
+        return self.interest.sum(axis=-1)
+
+
+def project(balances, annual_rates, payments, extra=0.0, strategy='minimum', max_months=MAX_MONTHS):
+    """Project payoff for every debt under one or more extra-payment scenarios
+
+    balances, annual_rates and payments have one entry per debt; extra is a
+    scalar or one monthly amount per scenario. 'minimum' pays each debt its own
+    payment with no extra. 'avalanche' (highest rate first) and 'snowball'
+    (lowest balance first) put the extra amount, plus the payments freed up as
+    debts are repaid, onto one target debt at a time. Only debts repaid during
+    the projection free up their payment; one already at zero is not being
+    paid. The result arrays are (scenarios, debts).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown payoff strategy '{strategy}' (expected one of {STRATEGIES})")
+    extra = np.atleast_1d(np.asarray(extra, dtype=float))
+    scenarios = len(extra)
+    balance = np.tile(np.asarray(balances, dtype=float), (scenarios, 1))
+    monthly_rate = np.broadcast_to(np.asarray(annual_rates, dtype=float) / 12, balance.shape)
+    minimum = np.broadcast_to(np.asarray(payments, dtype=float), balance.shape)
+    rows = np.arange(scenarios)
+
+    payoff = np.where(balance <= 0, 0.0, np.inf)
+    outstanding = balance > 0
+    interest = np.zeros_like(balance)
+    elapsed = np.zeros(scenarios)
+
+    # Each pass advances every scenario to its next payoff, so there are at most debts + 1 passes
+    for _ in range(balance.shape[1] + 1):
+        active = balance > 0
+        running = active.any(axis=1) & (elapsed < max_months)
+        if not running.any():
+            break
+
+        allocation = np.where(active, minimum, 0.0)
+        if strategy != 'minimum':
+            freed = np.where(outstanding & ~active, minimum, 0.0).sum(axis=1)
+            priority = monthly_rate if strategy == 'avalanche' else -balance
+            target = np.where(active, priority, -np.inf).argmax(axis=1)
+            allocation[rows, target] += np.where(active[rows, target], extra + freed, 0.0)
+
+        to_payoff = np.where(active, months_to_payoff(balance, monthly_rate, allocation), np.inf)
+        step = np.minimum(to_payoff.min(axis=1), max_months - elapsed)
+        step = np.where(running, step, 0.0)[:, None]
+
+        # Debts repaid at the end of this step make a smaller final payment
+        repaid = active & (to_payoff <= step)
+        before_last = balance_after(balance, monthly_rate, allocation, np.maximum(step - 1, 0))
+        final_payment = before_last * (1 + monthly_rate)
+        remaining = balance_after(balance, monthly_rate, allocation, step)
+        paid = np.where(repaid, allocation * np.maximum(step - 1, 0) + final_payment,
+                        allocation * step)
+        interest += np.where(active, paid - (balance - np.where(repaid, 0.0, remaining)), 0.0)
+
+        payoff = np.where(repaid, elapsed[:, None] + step, payoff)
+        balance = np.where(repaid, 0.0, np.where(active, remaining, balance))
+        elapsed = elapsed + step[:, 0]
+
+    return DebtProjection(payoff, interest)
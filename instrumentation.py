@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Timing and memory instrumentation for the Financial Dashboard streamliner
+Pipeline phases run inside spans; each finished span is handed to the
+registered hooks as a plain dict (see JsonLinesHook for the JSON lines sink)
+"""
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """Collects spans and passes each finished one to the registered hooks"""
+    def __init__(self, hooks=None, trace_memory=False, run_id=None):
+        self.hooks = list(hooks or [])
+        self.trace_memory = trace_memory
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.records = []
+        self._stack = []
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def _traced_peak(self):
+        return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Time a block; the yielded dict can be filled with rows, cells and other fields"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        record = {'run_id': self.run_id, 'name': name,
+                  'parent': self._stack[-1]['name'] if self._stack else None}
+        record.update(fields)
+        record.setdefault('rows', None)
+        record.setdefault('cells', None)
+
+        # Fold the peak so far into the enclosing spans before restarting the measurement
+        peak = self._traced_peak()
+        for parent in self._stack:
+            parent['_peak'] = max(parent['_peak'], peak)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        record['_peak'] = 0
+
+        self._stack.append(record)
+        record['start'] = time.time()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['duration_s'] = round(time.perf_counter() - start, 6)
+            self._stack.pop()
+
+            peak = max(record.pop('_peak'), self._traced_peak())
+            for parent in self._stack:
+                parent['_peak'] = max(parent['_peak'], peak)
+            record['tracemalloc_peak_mb'] = round(peak / (1024 * 1024), 3) if tracemalloc.is_tracing() else None
+
+            self.emit(record)
+
+    def emit(self, record):
+        """Store a finished span and pass it to every hook"""
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+
+class JsonLinesHook:
+    """Hook writing one JSON object per span to a file path or open stream"""
+    def __init__(self, target=None):
+        if target is None:
+            self.stream, self._owned = sys.stdout, False
+        elif hasattr(target, 'write'):
+            self.stream, self._owned = target, False
+        else:
+            self.stream, self._owned = open(target, 'a'), True
+
+    def __call__(self, record):
+        self.stream.write(json.dumps(record, default=str) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        if self._owned:
+            self.stream.close()
+
+
+def count_cells(ws):
+    """Number of cells held by an openpyxl, streaming or recording worksheet"""
+    if hasattr(ws, 'cell_count'):
+        return ws.cell_count
+    return len(ws._cells)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Month x standardized category x type aggregate of the expense detail sheets
+The transaction rows are scanned once into the cube; report tabs read their
+totals from it, and the latest cube of each source workbook is kept in the
+Parquet cache between runs
+"""
+import hashlib
+import json
+import os
+import pandas as pd
+from sheet_cache import HAS_PYARROW, DEFAULT_CACHE_DIR
+from sheet_manifest import fingerprint_frame
+
+CUBE_VERSION = 1
+CUBE_COLUMNS = ['Month', 'Category', 'Type', 'Amount', 'Count']
+
+
+def cube_key(frames, settings):
+    """Cache key from the source sheet fingerprints and the categorisation settings
+
+    Sheets read out of core are passed as a workbook signature instead of a frame.
+    """
+    payload = {
+        'version': CUBE_VERSION,
+        'sheets': {name: fingerprint_frame(df) if isinstance(df, pd.DataFrame) else df
+                   for name, df in sorted(frames.items())},
+        'settings': settings
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class MonthlyCube:
+    """Summed amounts and row counts per (month, category, type)
+
+    Undated rows keep a missing Month and uncategorised rows a missing
+    Category, so grand totals still include them.
+    """
+    def __init__(self, cells, unmapped=None):
+        self.cells = cells
+        self.unmapped = set(unmapped or [])
+
+    @classmethod
+    def from_expenses(cls, expenses, unmapped=None):
+        """Aggregate a frame with Month, Category, Type and Amount columns"""
+        cells = (expenses.groupby(['Month', 'Category', 'Type'], dropna=False, sort=True)['Amount']
+                 .agg(['sum', 'count'])
+                 .rename(columns={'sum': 'Amount', 'count': 'Count'})
+                 .reset_index())
+        cells['Month'] = cells['Month'].astype('period[M]')
+        return cls(cells[CUBE_COLUMNS], unmapped)
+
+    @classmethod
+    def combine(cls, cubes):
+        """Merge cubes aggregated from separate chunks of rows into one"""
+        cubes = list(cubes)
+        cells = (pd.concat([cube.cells for cube in cubes], ignore_index=True)
+                 .groupby(['Month', 'Category', 'Type'], dropna=False, sort=True)[['Amount', 'Count']]
+                 .sum()
+                 .reset_index())
+        cells['Month'] = cells['Month'].astype('period[M]')
+        return cls(cells[CUBE_COLUMNS], set().union(*(cube.unmapped for cube in cubes)))
+
+    def total(self):
+        return self.cells['Amount'].sum()
+
+    def months(self):
+        """Every calendar month between the first and last dated entry"""
+        dated = self.cells['Month'].dropna()
+        if dated.empty:
+            return pd.PeriodIndex([], freq='M')
+        return pd.period_range(dated.min(), dated.max(), freq='M')
+
+    def by_category(self):
+        """Total per standardized category"""
+        return self.cells.groupby('Category', sort=False)['Amount'].sum()
+
+    def by_month(self, column):
+        """Month x category or month x type grid over every month in the span, empty months as zero"""
+        dated = self.cells[self.cells['Month'].notna()]
+        grid = dated.pivot_table(index='Month', columns=column, values='Amount',
+                                 aggfunc='sum', fill_value=0)
+        return grid.reindex(self.months(), fill_value=0)
+
+    def year_to_date(self, month):
+        """Current Month and YTD totals per category, from January of the same year through month"""
+        cells = self.cells[self.cells['Month'].notna()]
+        months = cells['Month']
+        in_year = (months.dt.year == month.year) & (months <= month)
+        ytd = cells[in_year]
+        return pd.DataFrame({
+            'Current Month': ytd[ytd['Month'] == month].groupby('Category')['Amount'].sum(),
+            'YTD': ytd.groupby('Category')['Amount'].sum()
+        }).fillna(0)
+
+    @classmethod
+    def cache_path(cls, source_file, cache_dir=None):
+        """One cube file per source workbook, overwritten whenever its contents change"""
+        name = hashlib.sha1(os.path.abspath(source_file).encode('utf-8')).hexdigest()
+        return os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'cubes', f"{name}.parquet")
+
+    @classmethod
+    def load(cls, source_file, key, cache_dir=None):
+        """Return the cached cube of a workbook if it was built for key, else None"""
+        if not HAS_PYARROW:
+            return None
+        try:
+            cells = pd.read_parquet(cls.cache_path(source_file, cache_dir))
+        except Exception:
+            return None
+        if cells.attrs.get('key') != key or cells.attrs.get('version') != CUBE_VERSION:
+            return None
+        cells['Month'] = pd.PeriodIndex(cells['Month'], freq='M')
+        return cls(cells[CUBE_COLUMNS], cells.attrs.get('unmapped'))
+
+    def save(self, source_file, key, cache_dir=None):
+        """Persist the cube in place of the workbook's previous one; skipped without Parquet support"""
+        if not HAS_PYARROW:
+            return False
+        path = self.cache_path(source_file, cache_dir)
+        cells = self.cells.copy()
+        cells['Month'] = cells['Month'].astype(str).where(cells['Month'].notna())
+        # The key travels inside the file, so a reader never pairs cells with another run's key
+        cells.attrs = {'key': key, 'version': CUBE_VERSION, 'unmapped': sorted(self.unmapped)}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cells.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            return False
+        return True
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Row-buffered worksheet base shared by the streaming and XlsxWriter backends
+Buffers cells by row behind the Worksheet subset the tab builders use
+(cell(), ws['A1'], append(), auto_fit()); subclasses decide how finished
+rows and column widths are written out
+"""
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+from column_widths import measure_column_widths
+
+# A named style replaces the whole cell style, so it is applied before the individual attributes
+STYLE_ATTRIBUTES = ('style', 'font', 'fill', 'number_format', 'alignment', 'border')
+
+
+class RecordedCell:
+    """Value plus the style attributes a builder set on it"""
+    __slots__ = ('value',) + STYLE_ATTRIBUTES
+
+    def __init__(self, value=None):
+        self.value = value
+        for name in STYLE_ATTRIBUTES:
+            setattr(self, name, None)
+
+    @property
+    def has_style(self):
+        return any(getattr(self, name) is not None for name in STYLE_ATTRIBUTES)
+
+
+class RowBuffer:
+    """Cells buffered by row until they are flushed
+
+    Appended rows keep their plain values; a cell object (cell_class) is only
+    created when a builder addresses the cell. Rows are flushed in order once
+    more than flush_rows are buffered, keeping the newest row open so builders
+    can still style it.
+    Column widths are written before the first row: the ones passed to
+    set_column_widths(), or else auto-fitted from the rows buffered by then.
+    Subclasses implement _write_row() and _write_column_width().
+    """
+    cell_class = RecordedCell
+
+    def __init__(self, title, flush_rows=1000, max_width=30):
+        self.title = title
+        self.flush_rows = flush_rows
+        self.max_width = max_width
+        self._rows = {}
+        self._next_row = 1
+        self._max_row = 0
+        self._cells_flushed = 0
+        self._widths_written = False
+
+    @property
+    def max_row(self):
+        return self._max_row
+
+    @property
+    def cell_count(self):
+        return self._cells_flushed + sum(len(cells) for cells in self._rows.values())
+
+    def _new_cell(self, value):
+        return self.cell_class(value)
+
+    def cell(self, row, column, value=None):
+        if row < self._next_row:
+            raise ValueError(f"Row {row} of '{self.title}' has already been flushed")
+        cells = self._rows.setdefault(row, {})
+        cell = cells.get(column)
+        if not isinstance(cell, self.cell_class):
+            cell = cells[column] = self._new_cell(cell)
+        if value is not None:
+            cell.value = value
+        self._max_row = max(self._max_row, row)
+        return cell
+
+    def __getitem__(self, coordinate):
+        column, row = coordinate_from_string(coordinate)
+        return self.cell(row=row, column=column_index_from_string(column))
+
+    def __setitem__(self, coordinate, value):
+        self[coordinate].value = value
+
+    def append(self, values):
+        """Append values as a new row below the last buffered row"""
+        row = self._max_row + 1
+        # Plain values are kept as-is and only wrapped in a cell if styled later
+        self._rows[row] = {column: value for column, value in enumerate(values, 1)
+                           if value is not None}
+        self._max_row = row
+        if len(self._rows) > self.flush_rows:
+            self.flush(row - 1)
+
+    def auto_fit(self, max_width=30):
+        """Set the width cap used when column widths are fitted"""
+        self.max_width = max_width
+
+    def _buffered_values(self):
+        for row in sorted(self._rows):
+            cells = self._rows[row]
+            values = [None] * (max(cells) if cells else 0)
+            for column, cell in cells.items():
+                values[column - 1] = cell.value if isinstance(cell, self.cell_class) else cell
+            yield values
+
+    def set_column_widths(self, widths):
+        """Use precomputed {column index: width} instead of auto-fitting at the first flush"""
+        if self._widths_written:
+            return
+        for column, width in widths.items():
+            self._write_column_width(column, width)
+        self._widths_written = True
+
+    def _write_column_width(self, column, width):
+        raise NotImplementedError
+
+    def _write_row(self, row, cells):
+        """Write one row of buffered {column: cell or plain value}"""
+        raise NotImplementedError
+
+    def flush(self, upto=None):
+        """Write buffered rows up to and including upto (all rows by default)"""
+        if upto is None:
+            upto = self._max_row
+        if not self._widths_written:
+            self.set_column_widths(measure_column_widths(self._buffered_values(), self.max_width))
+        while self._next_row <= upto:
+            cells = self._rows.pop(self._next_row, {})
+            self._write_row(self._next_row, cells)
+            self._cells_flushed += len(cells)
+            self._next_row += 1
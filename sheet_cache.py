@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+On-disk Parquet cache of parsed workbook sheets
+Entries are keyed by workbook path and sheet name, and dropped as soon as the
+workbook's mtime or size changes
+"""
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'financial_dashboard')
+
+
+class SheetCache:
+    """Parquet copies of the parsed sheets of one workbook"""
+    def __init__(self, file_path, cache_dir=None):
+        self.file_path = os.path.abspath(file_path)
+        self.enabled = HAS_PYARROW
+        key = hashlib.sha1(self.file_path.encode('utf-8')).hexdigest()
+        self.directory = os.path.join(cache_dir or DEFAULT_CACHE_DIR, key)
+        self.meta_path = os.path.join(self.directory, 'meta.json')
+        self.meta = self._load_meta() if self.enabled else None
+
+    def _signature(self):
+        stat = os.stat(self.file_path)
+        return {'path': self.file_path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def _load_meta(self):
+        """Read the cache index, discarding it if the workbook has changed since"""
+        signature = self._signature()
+        fresh = dict(signature, sheet_names=None, sheets={})
+        try:
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return fresh
+        if any(meta.get(key) != value for key, value in signature.items()):
+            shutil.rmtree(self.directory, ignore_errors=True)
+            return fresh
+        return meta
+
+    def _save_meta(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    @property
+    def sheet_names(self):
+        return self.meta['sheet_names'] if self.enabled else None
+
+    def store_sheet_names(self, sheet_names):
+        if not self.enabled:
+            return
+        self.meta['sheet_names'] = list(sheet_names)
+        self._save_meta()
+
+    def has(self, sheet):
+        """Whether a sheet is cached, without reading it"""
+        return self.enabled and sheet in self.meta['sheets']
+
+    def get(self, sheet):
+        """Return the cached DataFrame for a sheet, or None on a miss"""
+        if not self.enabled or sheet not in self.meta['sheets']:
+            return None
+        try:
+            return pd.read_parquet(os.path.join(self.directory, self.meta['sheets'][sheet]))
+        except Exception:
+            return None
+
+    def put(self, sheet, df):
+        """Store a parsed sheet; sheets Parquet cannot represent are skipped"""
+        if not self.enabled:
+            return False
+        filename = hashlib.sha1(sheet.encode('utf-8')).hexdigest() + '.parquet'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            df.to_parquet(os.path.join(self.directory, filename))
+        except Exception:
+            return False
+        self.meta['sheets'][sheet] = filename
+        self._save_meta()
+        return True
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Per-sheet content fingerprints for incremental Financial Dashboard rebuilds
+"""
+import hashlib
+import json
+import os
+import pandas as pd
+
+MANIFEST_VERSION = 1
+
+
+def fingerprint_frame(df):
+    """Return a stable content hash for a loaded sheet"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+    digest.update(str(df.shape).encode('utf-8'))
+    if not df.empty:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def manifest_path_for(output_file):
+    """Manifest file stored next to the output workbook"""
+    root, _ = os.path.splitext(output_file)
+    return f"{root}.manifest.json"
+
+
+class SheetManifest:
+    """Source sheet fingerprints recorded for the last successful run"""
+    def __init__(self, path, sheets=None, settings=None):
+        self.path = path
+        self.sheets = sheets or {}
+        self.settings = settings or {}
+
+    @classmethod
+    def load(cls, path):
+        """Read a manifest, returning an empty one if missing or unreadable"""
+        try:
+            with open(path, 'r') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if payload.get('version') != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, payload.get('sheets'), payload.get('settings'))
+
+    @classmethod
+    def from_data(cls, path, data, settings=None):
+        """Fingerprint every loaded sheet"""
+        sheets = {name: fingerprint_frame(df) for name, df in data.items()}
+        return cls(path, sheets, settings)
+
+    def changed_sheets(self, other):
+        """Sheet names whose fingerprint differs from another manifest"""
+        names = set(self.sheets) | set(other.sheets)
+        return {name for name in names if self.sheets.get(name) != other.sheets.get(name)}
+
+    def save(self):
+        payload = {
+            'version': MANIFEST_VERSION,
+            'settings': self.settings,
+            'sheets': self.sheets
+        }
+        with open(self.path, 'w') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Declarative schemas for the 13 source sheets of the Financial Dashboard
+Each schema lists the columns the streamliner reads, with accepted aliases,
+dtypes and date columns. Sheets are parsed with only those columns and
+explicit dtypes, and a header check fails fast with a drift report when a
+sheet no longer has a column the tabs need. Parsed frames are then compacted:
+repeated strings become categoricals and integer columns are downcast
+"""
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+
+# pandas dtype forced at parse time; numbers keep the int or float type the reader infers
+PARSE_DTYPES = {'string': str}
+
+INT32 = np.iinfo(np.int32)
+
+
+def frame_memory(df):
+    """Bytes held by a DataFrame, including the Python strings in object columns"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def downcast_numbers(series):
+    """int32 for an int64 column whose values fit, otherwise the series unchanged
+
+    Floats stay float64: amounts with cents do not survive float32, and
+    float32 arithmetic would change the totals the tabs report. int32 rather
+    than anything smaller keeps sums of balances clear of overflow.
+    """
+    if (pd.api.types.is_integer_dtype(series) and series.dtype.itemsize > 4 and not series.empty
+            and INT32.min <= series.min() and series.max() <= INT32.max):
+        return series.astype('int32')
+    return series
+
+
+class ColumnSpec:
+    """One source column: canonical name, type ('number', 'string' or 'date'), aliases
+
+    repeated marks a string column with few distinct values (merchants,
+    categories, types), which is held as a categorical.
+    """
+    def __init__(self, name, kind, required=True, aliases=(), repeated=False):
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.aliases = tuple(aliases)
+        self.repeated = repeated
+
+    def matches(self, header):
+        """Whether a header cell names this column (aliases and case/spacing differences allowed)"""
+        key = str(header).strip().casefold()
+        return any(key == name.casefold() for name in (self.name,) + self.aliases)
+
+    def describe(self):
+        return {'name': self.name, 'kind': self.kind, 'required': self.required,
+                'aliases': list(self.aliases), 'repeated': self.repeated}
+
+
+class SchemaDriftError(ValueError):
+    """Raised when source sheets lack required columns or hold values of the wrong type"""
+    def __init__(self, report):
+        self.report = report
+        lines = ["Source sheets do not match their schemas:"]
+        for entry in report:
+            if entry.get('missing'):
+                lines.append(f"  {entry['sheet']}: missing {', '.join(entry['missing'])} "
+                             f"(found {', '.join(map(str, entry['found']))})")
+            if entry.get('error'):
+                lines.append(f"  {entry['sheet']}: {entry['error']}")
+        super().__init__('\n'.join(lines))
+
+
+class SheetSchema:
+    """Columns the streamliner reads from one source sheet
+
+    A schema with no columns describes a sheet no tab reads; it is never parsed.
+    """
+    def __init__(self, sheet, columns):
+        self.sheet = sheet
+        self.columns = list(columns)
+
+    @property
+    def key(self):
+        """Short hash of the schema, so cached frames are tied to the columns they were parsed with"""
+        payload = json.dumps([column.describe() for column in self.columns], sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    def resolve(self, headers):
+        """({canonical name: source header}, [missing required columns]) for a sheet's header row"""
+        resolved, missing = {}, []
+        for column in self.columns:
+            source = next((header for header in headers if header == column.name), None)
+            if source is None:
+                source = next((header for header in headers if column.matches(header)), None)
+            if source is not None:
+                resolved[column.name] = source
+            elif column.required:
+                missing.append(column.name)
+        return resolved, missing
+
+    def drift(self, headers):
+        """Drift report entry for a header row, or None when every required column is there"""
+        _, missing = self.resolve(headers)
+        if not missing:
+            return None
+        return {'sheet': self.sheet, 'missing': missing, 'found': list(headers)}
+
+    def value_drift(self, error):
+        """SchemaDriftError for a ValueError raised while parsing or conforming this sheet's values"""
+        return SchemaDriftError([{'sheet': self.sheet, 'error': f"values do not match the declared types ({error})"}])
+
+    def parse_options(self, headers):
+        """read_excel usecols and dtype for a sheet with the given header row"""
+        resolved, _ = self.resolve(headers)
+        kinds = {column.name: column.kind for column in self.columns}
+        dtype = {source: PARSE_DTYPES[kinds[name]] for name, source in resolved.items()
+                 if kinds[name] in PARSE_DTYPES}
+        return list(resolved.values()), dtype
+
+    def conform(self, df):
+        """Rename aliased columns to their canonical names, order them as declared and apply the types"""
+        resolved, _ = self.resolve(list(df.columns))
+        df = df[list(resolved.values())]
+        df.columns = list(resolved)
+        for column in self.columns:
+            if column.name not in df.columns:
+                continue
+            series = df[column.name]
+            if column.kind == 'date' and not pd.api.types.is_datetime64_any_dtype(series):
+                df[column.name] = pd.to_datetime(series, errors='coerce')
+            elif column.kind == 'number' and not pd.api.types.is_numeric_dtype(series):
+                # Blank cells are fine; text in a numeric column raises ValueError
+                df[column.name] = pd.to_numeric(series)
+            elif column.kind == 'string' and not pd.api.types.is_string_dtype(series):
+                df[column.name] = series.astype(str).where(series.notna())
+        return df
+
+    def compact(self, df):
+        """Memory-compact copy of a conformed frame: categoricals for repeated strings, int32 where it fits"""
+        df = df.copy()
+        for column in self.columns:
+            if column.name not in df.columns:
+                continue
+            if column.repeated:
+                df[column.name] = df[column.name].astype('category')
+            elif column.kind == 'number':
+                df[column.name] = downcast_numbers(df[column.name])
+        return df
+
+
+def expense_detail_schema(sheet):
+    return SheetSchema(sheet, [
+        ColumnSpec('date', 'date', aliases=('Transaction Date',)),
+        ColumnSpec('company', 'string', required=False, aliases=('Merchant', 'Payee'), repeated=True),
+        ColumnSpec('category', 'string', repeated=True),
+        ColumnSpec('price', 'number', aliases=('Amount', 'Cost'))
+    ])
+
+
+def debt_detail_schema(sheet):
+    return SheetSchema(sheet, [
+        ColumnSpec('date', 'date', required=False),
+        ColumnSpec('payment', 'number', required=False, aliases=('Monthly Payment',)),
+        ColumnSpec('current debt amount', 'number', aliases=('Balance', 'Current Balance'))
+    ])
+
+
+SOURCE_SCHEMAS = {schema.sheet: schema for schema in [
+    SheetSchema('Income vs Expenses', [
+        ColumnSpec('Start Date', 'date'),
+        ColumnSpec('Net Pay', 'number'),
+        ColumnSpec('Personal Expenses', 'number'),
+        ColumnSpec('50% Shared Expenses', 'number', aliases=('Shared Expenses (50%)',))
+    ]),
+    # Month x category pivots of the detail sheets; no tab reads them
+    SheetSchema('Personal Expenses', []),
+    expense_detail_schema('Personal Expenses Detail'),
+    SheetSchema('Shared Expenses', []),
+    expense_detail_schema('Shared Expenses Detail'),
+    SheetSchema('Income', [
+        # Only the Monthly Summary fallback reads it, and only when present
+        ColumnSpec('date', 'date', required=False, aliases=('Pay Date',)),
+        ColumnSpec('Net Pay', 'number')
+    ]),
+    SheetSchema('Account Balances', [
+        ColumnSpec('Asset Category', 'string', aliases=('Account',)),
+        ColumnSpec('Amount', 'number', aliases=('Balance',)),
+        ColumnSpec('3-Month Change', 'number', required=False, aliases=('3 Month Change',))
+    ]),
+    SheetSchema('Katherine Assets', [
+        ColumnSpec('Name', 'string'),
+        ColumnSpec('Type', 'string', required=False, repeated=True),
+        ColumnSpec('Balance', 'number', aliases=('Amount',))
+    ]),
+    SheetSchema('Debt Summary', [
+        ColumnSpec('Debt Type', 'string', aliases=('Debt',), repeated=True),
+        ColumnSpec('Balance', 'number'),
+        ColumnSpec('Monthly Payment', 'number', required=False, aliases=('Payment',)),
+        ColumnSpec('Interest Rate', 'number', required=False, aliases=('Rate', 'APR'))
+    ]),
+    debt_detail_schema('Car'),
+    debt_detail_schema('Credit Line'),
+    debt_detail_schema('Home Energy'),
+    debt_detail_schema('Mortgage')
+]}
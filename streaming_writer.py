@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Streaming output backend for the Financial Dashboard scripts
+Wraps openpyxl write-only worksheets so the tab builders can keep using
+cell()/append()/merge_cells() while finished rows are flushed to disk
+"""
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from row_buffer import RowBuffer
+
+
+class StreamingWorksheet(RowBuffer):
+    """Row buffer in front of a write-only worksheet
+
+    Buffered cells are openpyxl write-only cells, so builders style them as
+    usual; finished rows are appended to the write-only worksheet.
+    """
+    cell_class = Cell
+
+    def __init__(self, ws, flush_rows=1000, max_width=30):
+        super().__init__(ws.title, flush_rows, max_width)
+        self.ws = ws
+
+    @property
+    def parent(self):
+        return self.ws.parent
+
+    @property
+    def column_dimensions(self):
+        return self.ws.column_dimensions
+
+    @property
+    def merged_cells(self):
+        return self.ws.merged_cells
+
+    def _new_cell(self, value):
+        return WriteOnlyCell(self.ws, value=value)
+
+    def merge_cells(self, range_string):
+        self.ws.merged_cells.add(range_string)
+
+    def add_data_validation(self, data_validation):
+        self.ws.data_validations.append(data_validation)
+
+    def _write_column_width(self, column, width):
+        self.ws.column_dimensions[get_column_letter(column)].width = width
+
+    def _write_row(self, row, cells):
+        values = [None] * (max(cells) if cells else 0)
+        for column, cell in cells.items():
+            values[column - 1] = cell
+        self.ws.append(values)
+
+
+class StreamingWorkbook:
+    """Write-only workbook whose sheets are StreamingWorksheet buffers"""
+    def __init__(self, flush_rows=1000):
+        self.wb = Workbook(write_only=True)
+        self.flush_rows = flush_rows
+        self._sheets = {}
+
+    @property
+    def sheetnames(self):
+        return list(self._sheets)
+
+    def create_sheet(self, title):
+        ws = StreamingWorksheet(self.wb.create_sheet(title=title), self.flush_rows)
+        self._sheets[title] = ws
+        return ws
+
+    def __getitem__(self, title):
+        return self._sheets[title]
+
+    def __contains__(self, title):
+        return title in self._sheets
+
+    def save(self, filename):
+        for ws in self._sheets.values():
+            ws.flush()
+        self.wb.save(filename)
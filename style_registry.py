@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Named styles shared by the Financial Dashboard tab builders
+Every style is registered once per workbook and applied to cells by
+reference, instead of building new Font/PatternFill objects for each cell
+that openpyxl then has to deduplicate at save time
+"""
+import copy
+import weakref
+from openpyxl.cell import Cell
+from openpyxl.styles import Font, NamedStyle, PatternFill
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+NUMBER_FORMATS = {
+    'currency': '"$"#,##0.00',
+    'percent': '0.0%',
+    'percent_2': '0.00%',
+    'integer': '#,##0',
+    'month': 'mmm yyyy',
+    'date': 'yyyy-mm-dd'
+}
+
+# Header fill colour of each output tab
+HEADER_FILLS = {
+    'Transaction Log': 'D9E2F3',
+    'Monthly Summary': 'E2EFDA',
+    'Account Balances': 'FFF2CC',
+    'Debt Tracking': 'FCE4D6',
+    'Budget Planning': 'DDEBF7',
+    'Category Analysis': 'E2E2E2'
+}
+
+
+def solid_fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type='solid')
+
+
+def header_style_name(tab):
+    return f"{tab} Header"
+
+
+def build_named_styles():
+    """Fresh NamedStyle objects for one workbook, keyed by name"""
+    styles = [
+        NamedStyle('Dashboard Title', font=Font(name='Arial', size=20, bold=True)),
+        NamedStyle('Dashboard Note', font=Font(name='Arial', size=12, italic=True)),
+        NamedStyle('Dashboard Section', font=Font(name='Arial', size=16, bold=True, color='FFFFFF'),
+                   fill=solid_fill('366092')),
+        NamedStyle('Bold Label', font=Font(bold=True)),
+        NamedStyle('Subsection Title', font=Font(bold=True, size=12))
+    ]
+    styles += [NamedStyle(header_style_name(tab), font=Font(bold=True), fill=solid_fill(color))
+               for tab, color in HEADER_FILLS.items()]
+    # Number formats keep the workbook's default font, as a plain formatted cell would
+    styles += [NamedStyle(f"Dashboard {kind}", font=copy.copy(DEFAULT_FONT), number_format=number_format)
+               for kind, number_format in NUMBER_FORMATS.items()]
+    return {style.name: style for style in styles}
+
+
+class StyleRegistry:
+    """The dashboard's named styles registered on one workbook
+
+    apply() copies the registered style array onto a cell, which is what
+    assigning cell.style does minus the name lookup. Without a workbook
+    (recorded worksheets) the style name is stored and resolved on replay.
+    """
+    def __init__(self, wb=None):
+        self._arrays = {}
+        if wb is None:
+            return
+        named_styles = build_named_styles()
+        existing = wb._named_styles.names
+        for name, style in named_styles.items():
+            if name in existing:
+                # Reopened output: reuse the style saved with it
+                style = wb._named_styles[name]
+            else:
+                wb.add_named_style(style)
+            self._arrays[name] = style.as_tuple()
+
+    def apply(self, cell, name):
+        if isinstance(cell, Cell):
+            cell._style = copy.copy(self._arrays[name])
+        else:
+            cell.style = name
+
+    def number_style(self, kind):
+        return f"Dashboard {kind}"
+
+
+_registries = weakref.WeakKeyDictionary()
+_unbound = StyleRegistry()
+
+
+def style_registry(ws):
+    """Registry for the workbook a worksheet belongs to, created on first use"""
+    wb = getattr(ws, 'parent', None)
+    if wb is None:
+        return _unbound
+    registry = _registries.get(wb)
+    if registry is None:
+        registry = _registries[wb] = StyleRegistry(wb)
+    return registry
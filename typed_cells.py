@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Typed cell writing for the Financial Dashboard tab builders
+Amounts, rates and dates are written as raw numbers and datetimes carrying a
+number format, never as pre-formatted text, so the output reads back without
+any string parsing
+"""
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from style_registry import NUMBER_FORMATS, style_registry
+
+
+def cell_value(value):
+    """Plain Python number or datetime for a cell, or None for missing values"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, pd.Period):
+        return value.to_timestamp().to_pydatetime()
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class TypedCellWriter:
+    """Writes typed values into one worksheet with the registry's number format styles
+
+    Unstyled cells get the shared named style for their format; cells that
+    already carry other styling get the number format set directly.
+    """
+    def __init__(self, ws):
+        self.ws = ws
+        self.styles = style_registry(ws)
+
+    def write(self, row, column, value, kind=None):
+        """Write a value with the number format for kind; missing values leave the cell empty"""
+        value = cell_value(value)
+        if value is None:
+            return None
+        cell = self.ws.cell(row=row, column=column)
+        cell.value = value
+        if kind is not None:
+            self.format(cell, kind)
+        return cell
+
+    def format(self, cell, kind):
+        """Apply the number format for kind to an existing cell"""
+        if cell.has_style:
+            cell.number_format = NUMBER_FORMATS[kind]
+        else:
+            self.styles.apply(cell, self.styles.number_style(kind))
@@ -2,55 +2,71 @@
 """
 Script to verify the streamlined Financial Dashboard Excel file
 """
-import pandas as pd
-from openpyxl import load_workbook
+import sys
+from workbook_loader import WorkbookLoader
 
-def verify_streamlined_file(file_path):
+# Tabs every streamlined dashboard should contain, in order
+EXPECTED_TABS = ['Dashboard', 'Transaction Log', 'Monthly Summary', 'Account Balances',
+                 'Debt Tracking', 'Budget Planning', 'Category Analysis']
+
+def verify_workbook(file_path, sheets=None, use_cache=True, engine=None):
+    """Describe the streamlined workbook's tabs as plain data and check none are missing"""
+    with WorkbookLoader(file_path, use_cache=use_cache, engine=engine) as loader:
+        summaries = list(loader.summaries(sheets, sample_rows=0))
+        sheet_names = list(loader.sheet_names)
+        engine = loader.engine
+    missing = [tab for tab in EXPECTED_TABS if tab not in sheet_names]
+    errors = [summary['sheet'] for summary in summaries if summary['error'] is not None]
+    return {'file': file_path, 'engine': engine, 'sheet_names': sheet_names, 'sheets': summaries,
+            'missing_tabs': missing, 'ok': not missing and not errors}
+
+def print_verification(report):
+    """Print a verify_workbook report"""
+    print(f"Total sheets: {len(report['sheet_names'])}")
+    print(f"Sheet names: {report['sheet_names']}")
+    print(f"Reader engine: {report['engine']}")
+    print()
+    
+    # Summarise each sheet briefly
+    for i, summary in enumerate(report['sheets'], 1):
+        print(f"{i}. Sheet: '{summary['sheet']}'")
+        print("-" * 30)
+        
+        if summary['error'] is not None:
+            print(f"   Error reading sheet: {summary['error']}")
+        else:
+            print(f"   Dimensions: {summary['rows']} rows × {summary['columns']} columns")
+            
+            if summary['rows'] or summary['columns']:
+                headers = summary['headers']
+                print(f"   Headers: {headers[:5]}{'...' if len(headers) > 5 else ''}")
+                print(f"   Non-empty rows: {summary['non_empty_rows']}")
+            else:
+                print("   Sheet appears to be empty")
+        
+        print()
+    
+    for tab in report['missing_tabs']:
+        print(f"✗ Missing tab: {tab}")
+
+def verify_streamlined_file(file_path, sheets=None, use_cache=True, engine=None):
     """Verify the structure of the streamlined Excel file"""
     print(f"Verifying Streamlined Dashboard: {file_path}")
     print("=" * 60)
     
     try:
-        # Load the workbook
-        wb = load_workbook(file_path, read_only=True)
-        
-        print(f"Total sheets: {len(wb.sheetnames)}")
-        print(f"Sheet names: {wb.sheetnames}")
-        print()
-        
-        # Analyze each sheet briefly
-        for i, sheet_name in enumerate(wb.sheetnames, 1):
-            print(f"{i}. Sheet: '{sheet_name}'")
-            print("-" * 30)
-            
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                print(f"   Dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
-                
-                if not df.empty:
-                    print(f"   Headers: {list(df.columns[:5])}{'...' if len(df.columns) > 5 else ''}")
-                    
-                    # Count non-empty rows
-                    non_empty_rows = df.dropna(how='all').shape[0]
-                    print(f"   Non-empty rows: {non_empty_rows}")
-                else:
-                    print("   Sheet appears to be empty")
-                    
-            except Exception as e:
-                print(f"   Error reading sheet: {e}")
-            
-            print()
-        
-        wb.close()
-        
+        # Open the workbook once (sheets come from the cache when unchanged)
+        report = verify_workbook(file_path, sheets, use_cache, engine)
+        print_verification(report)
     except Exception as e:
         print(f"Error analyzing file: {e}")
         return False
     
-    return True
+    return report['ok']
 
 def main():
-    file_path = "/Users/marcusberley/Desktop/Financial Dashboard - Streamlined.xlsx"
+    # Same as `dashboard_cli.py verify FILE`; the path argument is optional for the old workflow
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "/Users/marcusberley/Desktop/Financial Dashboard - Streamlined.xlsx"
     verify_streamlined_file(file_path)
     
     print("STREAMLINING RESULTS:")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Shared workbook loader for the Financial Dashboard scripts
+Opens a workbook once and parses every requested sheet from that single handle,
+reading through the Parquet sheet cache when it is available. Sheets are parsed
+with the Rust-backed calamine engine when python-calamine is installed, falling
+back to openpyxl otherwise or when calamine cannot read a sheet. Sheets with a
+schema are parsed with only their declared columns and dtypes
+"""
+import time
+import pandas as pd
+from sheet_cache import SheetCache
+from sheet_schemas import SchemaDriftError, frame_memory
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+READER_ENGINES = ('auto', 'calamine', 'openpyxl')
+FALLBACK_ENGINE = 'openpyxl'
+
+
+def resolve_engine(engine=None):
+    """pandas engine for a requested reader; 'auto' and 'calamine' need python-calamine installed"""
+    engine = engine or 'auto'
+    if engine not in READER_ENGINES:
+        raise ValueError(f"Unknown reader engine '{engine}' (expected one of {READER_ENGINES})")
+    if engine == FALLBACK_ENGINE or not HAS_CALAMINE:
+        return FALLBACK_ENGINE
+    return 'calamine'
+
+
+class WorkbookLoader:
+    """Single-open reader that parses sheets from one ExcelFile handle"""
+    def __init__(self, file_path, use_cache=True, cache_dir=None, engine=None, schemas=None):
+        self.file_path = file_path
+        self.engine = resolve_engine(engine)
+        self.schemas = schemas or {}
+        self.timings = {}
+        # Opening the workbook is timed apart from the sheets, so timings holds only sheet names
+        self.open_seconds = 0.0
+        self.sheet_engines = {}
+        self.cache = SheetCache(file_path, cache_dir) if use_cache else None
+        self.cache_hits = set()
+        # {sheet: {'before': bytes as parsed or None when cached, 'after': bytes once compacted}}
+        self.memory = {}
+        self._excel_file = None
+        self._fallback_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def excel_file(self):
+        """Open the workbook on first use and keep the handle for later sheets"""
+        if self._excel_file is None:
+            start = time.perf_counter()
+            try:
+                self._excel_file = pd.ExcelFile(self.file_path, engine=self.engine)
+            except Exception:
+                if self.engine == FALLBACK_ENGINE:
+                    raise
+                self.engine = FALLBACK_ENGINE
+                self._excel_file = pd.ExcelFile(self.file_path, engine=self.engine)
+            self.open_seconds = time.perf_counter() - start
+        return self._excel_file
+
+    def parse(self, sheet, **options):
+        """Parse one sheet, retrying with openpyxl if the fast engine fails on it"""
+        try:
+            df = self.excel_file.parse(sheet, **options)
+            self.sheet_engines[sheet] = self.engine
+        except Exception:
+            if self.engine == FALLBACK_ENGINE:
+                raise
+            if self._fallback_file is None:
+                self._fallback_file = pd.ExcelFile(self.file_path, engine=FALLBACK_ENGINE)
+            df = self._fallback_file.parse(sheet, **options)
+            self.sheet_engines[sheet] = FALLBACK_ENGINE
+        return df
+
+    def headers(self, sheet):
+        """Header row of a sheet, without parsing its data"""
+        return list(self.parse(sheet, nrows=0).columns)
+
+    def parse_with_schema(self, sheet, schema):
+        """Parse only the schema's columns with explicit dtypes, under their canonical names, and compact them"""
+        usecols, dtype = schema.parse_options(self.headers(sheet))
+        try:
+            df = schema.conform(self.parse(sheet, usecols=usecols, dtype=dtype))
+        except ValueError as e:
+            raise schema.value_drift(e)
+        before = frame_memory(df)
+        df = schema.compact(df)
+        self.memory[sheet] = {'before': before, 'after': frame_memory(df)}
+        return df
+
+    def cache_key(self, sheet):
+        """Cache entry name; schema-pruned frames are kept apart from fully parsed ones"""
+        schema = self.schemas.get(sheet)
+        return sheet if schema is None else f"{sheet} [schema {schema.key}]"
+
+    def check_schemas(self, sheets=None, schemas=None):
+        """Drift report entries for the requested sheets whose headers lack required columns"""
+        schemas = self.schemas if schemas is None else schemas
+        report = []
+        for sheet in self.select_sheets(sheets):
+            schema = schemas.get(sheet)
+            if schema is None or not schema.columns:
+                continue
+            # Cached frames were parsed with this schema, so their source has not drifted since
+            if schemas is self.schemas and self.cache is not None and self.cache.has(self.cache_key(sheet)):
+                continue
+            entry = schema.drift(self.headers(sheet))
+            if entry is not None:
+                report.append(entry)
+        return report
+
+    def validate_schemas(self, sheets=None):
+        """Raise SchemaDriftError listing every requested sheet that has drifted from its schema"""
+        report = self.check_schemas(sheets)
+        if report:
+            raise SchemaDriftError(report)
+
+    @property
+    def sheet_names(self):
+        if self.cache is not None and self.cache.sheet_names is not None:
+            return self.cache.sheet_names
+        sheet_names = self.excel_file.sheet_names
+        if self.cache is not None:
+            self.cache.store_sheet_names(sheet_names)
+        return sheet_names
+
+    def select_sheets(self, sheets=None):
+        """Return the requested sheets that exist in the workbook, in workbook order"""
+        if sheets is None:
+            return list(self.sheet_names)
+        wanted = set(sheets)
+        return [name for name in self.sheet_names if name in wanted]
+
+    def iter_sheets(self, sheets=None):
+        """Yield (sheet name, DataFrame or None, error or None, seconds) in one pass"""
+        for sheet in self.select_sheets(sheets):
+            schema = self.schemas.get(sheet)
+            if schema is not None and not schema.columns:
+                # Declared as unused: nothing to parse
+                continue
+            start = time.perf_counter()
+            df = self.cache.get(self.cache_key(sheet)) if self.cache is not None else None
+            error = None
+            if df is not None:
+                self.cache_hits.add(sheet)
+                if schema is not None:
+                    # Cached frames were compacted before they were stored
+                    self.memory[sheet] = {'before': None, 'after': frame_memory(df)}
+            else:
+                try:
+                    df = self.parse(sheet) if schema is None else self.parse_with_schema(sheet, schema)
+                    if self.cache is not None:
+                        self.cache.put(self.cache_key(sheet), df)
+                except SchemaDriftError:
+                    raise
+                except Exception as e:
+                    df = None
+                    error = e
+            elapsed = time.perf_counter() - start
+            self.timings[sheet] = elapsed
+            yield sheet, df, error, elapsed
+
+    def load(self, sheets=None, verbose=True):
+        """Load the requested sheets (all by default) into a dict of DataFrames
+
+        With schemas, every requested sheet's header is checked before any data
+        is parsed, and SchemaDriftError is raised if one has drifted.
+        """
+        if self.schemas:
+            self.validate_schemas(sheets)
+        data = {}
+        for sheet, df, error, elapsed in self.iter_sheets(sheets):
+            if error is not None:
+                if verbose:
+                    print(f"  ✗ Error loading '{sheet}': {error}")
+                continue
+            data[sheet] = df
+            if verbose:
+                source = 'cached' if sheet in self.cache_hits else f"{elapsed:.2f}s"
+                print(f"  ✓ Loaded '{sheet}' ({df.shape[0]} rows, {source}{memory_note(self.memory.get(sheet))})")
+        return data
+
+    def summaries(self, sheets=None, sample_rows=3):
+        """Yield a sheet_summary dict per sheet, in the same single pass as iter_sheets"""
+        for sheet, df, error, elapsed in self.iter_sheets(sheets):
+            yield sheet_summary(sheet, df, error, elapsed, sheet in self.cache_hits, sample_rows,
+                                self.sheet_engines.get(sheet))
+
+    def close(self):
+        for handle in (self._excel_file, self._fallback_file):
+            if handle is not None:
+                handle.close()
+        self._excel_file = None
+        self._fallback_file = None
+
+
+def format_bytes(size):
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def memory_note(memory):
+    """', 4.2 MB → 1.1 MB' for a sheet's before/after memory report ('' when there is none)"""
+    if memory is None:
+        return ''
+    if memory['before'] is None:
+        return f", {format_bytes(memory['after'])}"
+    return f", {format_bytes(memory['before'])} → {format_bytes(memory['after'])}"
+
+
+def sheet_summary(sheet, df, error=None, seconds=None, cached=False, sample_rows=3, engine=None):
+    """Plain-data description of one parsed sheet, shared by the analyzer, verifier and CLI"""
+    summary = {'sheet': sheet, 'seconds': None if seconds is None else round(seconds, 6),
+               'cached': cached, 'engine': engine, 'error': None if error is None else str(error)}
+    if df is None:
+        return summary
+    non_empty = df.dropna(how='all')
+    summary.update(rows=int(df.shape[0]), columns=int(df.shape[1]),
+                   headers=[str(column) for column in df.columns],
+                   non_empty_rows=int(non_empty.shape[0]), sample=[])
+    for idx, row in non_empty.head(sample_rows).iterrows():
+        values = row.dropna()
+        if len(values) > 0:
+            summary['sample'].append({'row': idx, 'values': dict(list(values.items())[:5])})
+    return summary
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Constant-memory XlsxWriter output backend for the Financial Dashboard scripts
+Implements the worksheet surface the tab builders write through (cell(),
+append(), merge_cells(), add_data_validation(), auto_fit() and the named
+styles from style_registry) on top of XlsxWriter's constant_memory mode, so
+finished rows go straight to disk and no openpyxl cell objects are kept
+"""
+from datetime import datetime
+from openpyxl.utils.cell import range_boundaries
+from row_buffer import RowBuffer, RecordedCell, STYLE_ATTRIBUTES
+from style_registry import build_named_styles
+from typed_cells import cell_value
+
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+# openpyxl gives datetimes this format when nothing else is set
+DATETIME_FORMAT = 'yyyy-mm-dd h:mm:ss'
+
+BORDER_STYLES = {'thin': 1, 'medium': 2, 'dashed': 3, 'dotted': 4, 'thick': 5, 'double': 6,
+                 'hair': 7, 'mediumDashed': 8, 'dashDot': 9, 'mediumDashDot': 10,
+                 'dashDotDot': 11, 'mediumDashDotDot': 12, 'slantDashDot': 13}
+
+
+def xlsx_color(color):
+    """'#RRGGBB' for an openpyxl Color, or None for theme and indexed colours"""
+    rgb = getattr(color, 'rgb', None)
+    if not isinstance(rgb, str):
+        return None
+    return '#' + rgb[-6:]
+
+
+def format_properties(font=None, fill=None, number_format=None, alignment=None, border=None):
+    """XlsxWriter format properties equivalent to openpyxl style objects"""
+    properties = {}
+    if font is not None:
+        for name, key in (('name', 'font_name'), ('sz', 'font_size'), ('b', 'bold'),
+                          ('i', 'italic'), ('strike', 'font_strikeout')):
+            value = getattr(font, name)
+            if value is not None:
+                properties[key] = value
+        if font.u:
+            properties['underline'] = 2 if font.u == 'double' else 1
+        if xlsx_color(font.color):
+            properties['font_color'] = xlsx_color(font.color)
+    if fill is not None and fill.fill_type == 'solid' and xlsx_color(fill.fgColor):
+        properties.update(pattern=1, bg_color=xlsx_color(fill.fgColor))
+    if number_format is not None and number_format != 'General':
+        properties['num_format'] = number_format
+    if alignment is not None:
+        if alignment.horizontal:
+            properties['align'] = alignment.horizontal
+        if alignment.vertical:
+            properties['valign'] = 'vcenter' if alignment.vertical == 'center' else alignment.vertical
+        if alignment.wrap_text:
+            properties['text_wrap'] = True
+    if border is not None:
+        for side in ('left', 'right', 'top', 'bottom'):
+            edge = getattr(border, side)
+            if edge is not None and edge.style in BORDER_STYLES:
+                properties[side] = BORDER_STYLES[edge.style]
+                if xlsx_color(edge.color):
+                    properties[f"{side}_color"] = xlsx_color(edge.color)
+    return properties
+
+
+# openpyxl DataValidation type and operator names mapped to XlsxWriter's
+VALIDATION_TYPES = {None: 'any', 'whole': 'integer', 'decimal': 'decimal', 'list': 'list',
+                    'date': 'date', 'time': 'time', 'textLength': 'length', 'custom': 'custom'}
+VALIDATION_CRITERIA = {None: 'between', 'between': 'between', 'notBetween': 'not between',
+                       'equal': 'equal to', 'notEqual': 'not equal to',
+                       'greaterThan': 'greater than', 'lessThan': 'less than',
+                       'greaterThanOrEqual': 'greater than or equal to',
+                       'lessThanOrEqual': 'less than or equal to'}
+
+
+def validation_options(data_validation):
+    """XlsxWriter data_validation() options for an openpyxl DataValidation"""
+    if data_validation.type not in VALIDATION_TYPES:
+        raise ValueError(f"Unsupported data validation type: {data_validation.type!r}")
+    validate = VALIDATION_TYPES[data_validation.type]
+    options = {'validate': validate, 'ignore_blank': bool(data_validation.allow_blank)}
+    formula = data_validation.formula1
+    if validate == 'list' and formula and formula.startswith('"'):
+        options['source'] = formula.strip('"').split(',')
+    elif validate == 'list':
+        options['source'] = formula
+    elif validate == 'custom':
+        options['value'] = formula
+    elif validate != 'any':
+        if data_validation.operator not in VALIDATION_CRITERIA:
+            raise ValueError(f"Unsupported data validation operator: {data_validation.operator!r}")
+        criteria = VALIDATION_CRITERIA[data_validation.operator]
+        options['criteria'] = criteria
+        if criteria in ('between', 'not between'):
+            options.update(minimum=formula, maximum=data_validation.formula2)
+        else:
+            options['value'] = formula
+    if data_validation.prompt:
+        options['input_message'] = data_validation.prompt
+    if data_validation.error:
+        options['error_message'] = data_validation.error
+    return options
+
+
+class XlsxWriterWorksheet(RowBuffer):
+    """Row buffer in front of a constant-memory XlsxWriter worksheet
+
+    Buffered cells are RecordedCells, so named styles and style attributes are
+    turned into (cached) XlsxWriter formats only when the row is written.
+    """
+    def __init__(self, workbook, ws, title, flush_rows=1000, max_width=30):
+        super().__init__(title, flush_rows, max_width)
+        self.workbook = workbook
+        self.ws = ws
+        self._merges = {}
+
+    @property
+    def parent(self):
+        # No openpyxl workbook: the style registry records style names on the cells
+        return None
+
+    def merge_cells(self, range_string):
+        min_col, min_row, max_col, max_row = range_boundaries(range_string)
+        # Constant-memory rows are written one at a time, so a merge cannot span rows
+        if min_row != max_row:
+            raise ValueError(f"Cannot merge {range_string} of '{self.title}': merges must stay within one row")
+        if min_row < self._next_row:
+            raise ValueError(f"Cannot merge {range_string} of '{self.title}': row {min_row} has been flushed")
+        self._merges.setdefault(min_row, []).append((min_col, max_col))
+
+    def add_data_validation(self, data_validation):
+        for cell_range in data_validation.sqref.ranges:
+            min_col, min_row, max_col, max_row = cell_range.bounds
+            self.ws.data_validation(min_row - 1, min_col - 1, max_row - 1, max_col - 1,
+                                    validation_options(data_validation))
+
+    def _write_column_width(self, column, width):
+        self.ws.set_column(column - 1, column - 1, width)
+
+    def _write_cell(self, row, column, cell):
+        """Write one buffered cell and return its (value, format)"""
+        value = cell_value(cell.value if isinstance(cell, RecordedCell) else cell)
+        cell_format = self.workbook.format_for(cell, DATETIME_FORMAT if isinstance(value, datetime) else None)
+        if value is None:
+            if cell_format is not None:
+                self.ws.write_blank(row - 1, column - 1, None, cell_format)
+        else:
+            self.ws.write(row - 1, column - 1, value, cell_format)
+        return value, cell_format
+
+    def _write_row(self, row, cells):
+        written = {}
+        for column in sorted(cells):
+            written[column] = self._write_cell(row, column, cells[column])
+        for min_col, max_col in self._merges.pop(row, []):
+            value, cell_format = written.get(min_col, (None, None))
+            self.ws.merge_range(row - 1, min_col - 1, row - 1, max_col - 1, value, cell_format)
+
+
+class XlsxWriterWorkbook:
+    """Constant-memory XlsxWriter workbook whose sheets are XlsxWriterWorksheet buffers
+
+    XlsxWriter needs the file name up front; save() may still pick another.
+    """
+    def __init__(self, filename, flush_rows=1000):
+        if not HAS_XLSXWRITER:
+            raise ImportError("The xlsxwriter backend needs the xlsxwriter package")
+        self.book = xlsxwriter.Workbook(filename, {'constant_memory': True, 'strings_to_urls': False})
+        self.flush_rows = flush_rows
+        self.named_styles = build_named_styles()
+        self._formats = {}
+        self._sheets = {}
+
+    @property
+    def sheetnames(self):
+        return list(self._sheets)
+
+    def create_sheet(self, title):
+        ws = XlsxWriterWorksheet(self, self.book.add_worksheet(title), title, self.flush_rows)
+        self._sheets[title] = ws
+        return ws
+
+    def __getitem__(self, title):
+        return self._sheets[title]
+
+    def __contains__(self, title):
+        return title in self._sheets
+
+    def format_for(self, cell, number_format=None):
+        """Shared format for a recorded cell's named style and attributes, or None when unstyled
+
+        number_format is the default used when neither the cell nor its named style sets one.
+        """
+        if isinstance(cell, RecordedCell):
+            attributes = tuple(getattr(cell, name) for name in STYLE_ATTRIBUTES)
+        else:
+            attributes = (None,) * len(STYLE_ATTRIBUTES)
+        key = attributes + (number_format,)
+        if key not in self._formats:
+            style = dict(zip(STYLE_ATTRIBUTES, attributes))
+            named = self.named_styles.get(style.pop('style'))
+            if named is not None:
+                # Attributes set on the cell override the ones from its named style
+                for name in style:
+                    if style[name] is None:
+                        style[name] = getattr(named, name)
+            if number_format is not None and style['number_format'] in (None, 'General'):
+                style['number_format'] = number_format
+            properties = format_properties(**style)
+            self._formats[key] = self.book.add_format(properties) if properties else None
+        return self._formats[key]
+
+    def save(self, filename):
+        for ws in self._sheets.values():
+            ws.flush()
+        self.book.filename = filename
+        self.book.close()